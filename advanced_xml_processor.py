@@ -1,14 +1,111 @@
-import os
 import zipfile
-import xml.etree.ElementTree as ET
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from lxml import etree
-from docx import Document
-from docx.oxml.ns import qn
-from docx.oxml import parse_xml
-from typing import Dict, List, Optional, Tuple, Any
-import re
-from copy import deepcopy
-import json
+from typing import Dict, List, Optional, Tuple, Any, Union
+
+# Word main namespace and Clark-notation tag names used by the property extractors
+W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+
+W_P = f'{{{W_NS}}}p'
+W_SECTPR = f'{{{W_NS}}}sectPr'
+W_TBL = f'{{{W_NS}}}tbl'
+
+W_PPR = f'{{{W_NS}}}pPr'
+W_PSTYLE = f'{{{W_NS}}}pStyle'
+W_JC = f'{{{W_NS}}}jc'
+W_SPACING = f'{{{W_NS}}}spacing'
+W_IND = f'{{{W_NS}}}ind'
+W_PBDR = f'{{{W_NS}}}pBdr'
+W_NUMPR = f'{{{W_NS}}}numPr'
+W_TABS = f'{{{W_NS}}}tabs'
+
+W_RFONTS = f'{{{W_NS}}}rFonts'
+W_SZ = f'{{{W_NS}}}sz'
+W_COLOR = f'{{{W_NS}}}color'
+W_B = f'{{{W_NS}}}b'
+W_I = f'{{{W_NS}}}i'
+W_STRIKE = f'{{{W_NS}}}strike'
+W_U = f'{{{W_NS}}}u'
+W_HIGHLIGHT = f'{{{W_NS}}}highlight'
+W_RPR = f'{{{W_NS}}}rPr'
+W_T = f'{{{W_NS}}}t'
+W_TAB = f'{{{W_NS}}}tab'
+W_BR = f'{{{W_NS}}}br'
+W_DRAWING = f'{{{W_NS}}}drawing'
+
+# Drawings are sometimes wrapped in markup-compatibility fallbacks inside a run
+MC_ALTERNATE_CONTENT = '{http://schemas.openxmlformats.org/markup-compatibility/2006}AlternateContent'
+
+# Clark-notation attribute names (w:sz and w:color double as tag names above)
+W_VAL = f'{{{W_NS}}}val'
+W_SPACE = f'{{{W_NS}}}space'
+W_SHADOW = f'{{{W_NS}}}shadow'
+W_POS = f'{{{W_NS}}}pos'
+W_LEADER = f'{{{W_NS}}}leader'
+W_BEFORE = f'{{{W_NS}}}before'
+W_AFTER = f'{{{W_NS}}}after'
+W_LINE = f'{{{W_NS}}}line'
+W_LINERULE = f'{{{W_NS}}}lineRule'
+W_LEFT = f'{{{W_NS}}}left'
+W_RIGHT = f'{{{W_NS}}}right'
+W_FIRSTLINE = f'{{{W_NS}}}firstLine'
+W_HANGING = f'{{{W_NS}}}hanging'
+W_ASCII = f'{{{W_NS}}}ascii'
+W_HANSI = f'{{{W_NS}}}hAnsi'
+W_EASTASIA = f'{{{W_NS}}}eastAsia'
+W_CS = f'{{{W_NS}}}cs'
+
+# ST_OnOff values that switch a toggle property (w:b, w:i, ...) off
+OFF_VALUES = frozenset(('0', 'false', 'off'))
+
+# rPr children whose w:val maps straight onto a run property key
+RUN_VAL_PROPERTIES = {
+    W_SZ: 'size',
+    W_COLOR: 'color',
+    W_U: 'underline',
+    W_HIGHLIGHT: 'highlight'
+}
+
+# rPr on/off toggles, keyed the same way
+RUN_TOGGLE_PROPERTIES = {
+    W_B: 'bold',
+    W_I: 'italic',
+    W_STRIKE: 'strike'
+}
+
+# Border side tags mapped to the keys used in the extracted border dict
+BORDER_SIDES = {
+    f'{{{W_NS}}}top': 'top',
+    f'{{{W_NS}}}left': 'left',
+    f'{{{W_NS}}}bottom': 'bottom',
+    f'{{{W_NS}}}right': 'right'
+}
+
+# Read-only parser options for docx parts: no entity expansion (docx never
+# needs it) and no comment nodes in the tree. iterparse() takes these as
+# keywords rather than a parser instance.
+_ITERPARSE_OPTIONS = {
+    'resolve_entities': False,
+    'huge_tree': True,
+    'remove_comments': True
+}
+
+# lxml parsers serialize concurrent use behind a lock, so each parsing
+# thread gets its own tuned parser (also skipping the ID hashtable)
+_parser_local = threading.local()
+
+def _get_fast_parser() -> etree.XMLParser:
+    """Return this thread's shared read-only XMLParser"""
+    parser = getattr(_parser_local, 'parser', None)
+    if parser is None:
+        parser = _parser_local.parser = etree.XMLParser(collect_ids=False, **_ITERPARSE_OPTIONS)
+    return parser
+
+def _serialize_interned(elem: etree._Element, blobs: Dict[bytes, bytes]) -> bytes:
+    """Serialize an element to UTF-8 bytes, sharing one buffer for identical XML"""
+    blob = etree.tostring(elem, encoding='utf-8')
+    return blobs.setdefault(blob, blob)
 
 class AdvancedDocumentProcessor:
     """
@@ -18,7 +115,7 @@ class AdvancedDocumentProcessor:
     
     # Word XML namespaces
     NAMESPACES = {
-        'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main',
+        'w': W_NS,
         'r': 'http://schemas.openxmlformats.org/officeDocument/2006/relationships',
         'wp': 'http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing',
         'a': 'http://schemas.openxmlformats.org/drawingml/2006/main',
@@ -34,10 +131,25 @@ class AdvancedDocumentProcessor:
         'wps': 'http://schemas.microsoft.com/office/word/2010/wordprocessingShape'
     }
     
-    def __init__(self):
-        # Register namespaces for XML parsing
-        for prefix, uri in self.NAMESPACES.items():
-            ET.register_namespace(prefix, uri)
+    # Supporting XML parts read alongside document.xml (structure key -> zip path)
+    XML_PARTS = {
+        'styles_xml': 'word/styles.xml',
+        'numbering_xml': 'word/numbering.xml',
+        'theme_xml': 'word/theme/theme1.xml',
+        'settings_xml': 'word/settings.xml',
+        'relationships': 'word/_rels/document.xml.rels',
+        'content_types': '[Content_Types].xml'
+    }
+    
+    # Header/footer parts (a bare substring test also matched e.g. media/headerImage.png)
+    HEADER_FOOTER_PREFIXES = ('word/header', 'word/footer')
+    
+    # Worker threads used to parse the independent XML parts concurrently
+    PARSE_WORKERS = 4
+    
+    # Precompiled XPath expressions (compiled once at class load, not per call)
+    _XP_R = etree.XPath('.//w:r', namespaces=NAMESPACES)
+    _XP_DRAWING = etree.XPath('.//w:drawing', namespaces=NAMESPACES)
     
     def extract_complete_structure(self, docx_path: str) -> Dict[str, Any]:
         """
@@ -63,25 +175,29 @@ class AdvancedDocumentProcessor:
             }
             
             with zipfile.ZipFile(docx_path, 'r') as docx_zip:
-                # Extract all XML files
-                structure['document_xml'] = self._read_xml_file(docx_zip, 'word/document.xml')
-                structure['styles_xml'] = self._read_xml_file(docx_zip, 'word/styles.xml')
-                structure['numbering_xml'] = self._read_xml_file(docx_zip, 'word/numbering.xml')
-                structure['theme_xml'] = self._read_xml_file(docx_zip, 'word/theme/theme1.xml')
-                structure['settings_xml'] = self._read_xml_file(docx_zip, 'word/settings.xml')
-                structure['relationships'] = self._read_xml_file(docx_zip, 'word/_rels/document.xml.rels')
-                structure['content_types'] = self._read_xml_file(docx_zip, '[Content_Types].xml')
+                # Index the archive once; every lookup below is an O(1) dict hit
+                name_map = {zi.filename: zi for zi in docx_zip.infolist()}
+            
+            # Every part is an independent decompress + parse, so run them in parallel
+            with ThreadPoolExecutor(max_workers=self.PARSE_WORKERS) as pool:
+                # Stream document.xml once, collecting paragraphs, sections and tables
+                document_future = pool.submit(self._with_zip, docx_path, self._stream_parse_document)
                 
-                # Parse document structure
-                if structure['document_xml']:
-                    structure['paragraphs'] = self._extract_paragraphs_with_full_formatting(
-                        structure['document_xml']
-                    )
-                    structure['sections'] = self._extract_sections(structure['document_xml'])
-                    structure['tables'] = self._extract_tables(structure['document_xml'])
+                # Extract the remaining XML parts (missing parts stay None)
+                part_futures = {
+                    key: pool.submit(self._with_zip, docx_path, self._read_xml_file, name_map[path])
+                    for key, path in self.XML_PARTS.items()
+                    if path in name_map
+                }
                 
                 # Extract headers/footers
-                structure['headers_footers'] = self._extract_headers_footers(docx_zip)
+                structure['headers_footers'] = self._extract_headers_footers(docx_path, name_map, pool)
+                
+                (structure['document_xml'], structure['paragraphs'],
+                 structure['sections'], structure['tables']) = document_future.result()
+                
+                for key, future in part_futures.items():
+                    structure[key] = future.result()
                 
             print(f"✅ Extracted {len(structure['paragraphs'])} paragraphs with complete formatting")
             return structure
@@ -90,55 +206,96 @@ class AdvancedDocumentProcessor:
             print(f"❌ Error extracting complete structure: {e}")
             return None
     
-    def _read_xml_file(self, zip_file: zipfile.ZipFile, path: str) -> Optional[etree._Element]:
+    def _with_zip(self, docx_path: str, reader, *args):
+        """Run a zip reader on its own ZipFile handle (handles aren't shared across threads)"""
+        with zipfile.ZipFile(docx_path, 'r') as docx_zip:
+            return reader(docx_zip, *args)
+    
+    def _read_xml_file(self, zip_file: zipfile.ZipFile, path: Union[str, zipfile.ZipInfo]) -> Optional[etree._Element]:
         """Read and parse XML file from docx zip"""
         try:
-            xml_content = zip_file.read(path)
-            return etree.fromstring(xml_content)
+            # Parse straight from the decompressing stream, no intermediate bytes
+            with zip_file.open(path) as xml_stream:
+                return etree.parse(xml_stream, _get_fast_parser()).getroot()
         except (KeyError, etree.XMLSyntaxError):
             return None
     
-    def _extract_paragraphs_with_full_formatting(self, document_xml: etree._Element) -> List[Dict]:
-        """Extract paragraphs with COMPLETE formatting information"""
-        paragraphs = []
+    def _stream_parse_document(self, docx_zip: zipfile.ZipFile) -> Tuple[Optional[etree._Element], List[Dict], List[Dict], List[Dict]]:
+        """
+        Parse word/document.xml in a single iterparse pass, building the
+        paragraph, section and table lists as each element's end tag arrives
+        """
+        paragraphs, sections, tables = [], [], []
+        targets = {W_P: paragraphs, W_SECTPR: sections, W_TBL: tables}
         
-        # Find all paragraphs in the document
-        para_elements = document_xml.xpath('.//w:p', namespaces=self.NAMESPACES)
+        # Slots are reserved on 'start' so every list stays in document order
+        # even for nested elements (sectPr inside pPr, paragraphs in table cells)
+        pending_slots = []
         
-        for i, para_elem in enumerate(para_elements):
-            para_data = {
-                'index': i,
-                'xml_element': etree.tostring(para_elem, encoding='unicode'),
-                'text': '',
-                'properties': self._extract_paragraph_properties(para_elem),
-                'runs': [],
-                'is_empty': False,
-                'contains_drawing': False,
-                'contains_table': False,
-                'style_id': None,
-                'numbering': None
-            }
-            
-            # Extract paragraph properties
-            ppr = para_elem.find('.//w:pPr', self.NAMESPACES)
-            if ppr is not None:
-                para_data['properties'] = self._extract_detailed_paragraph_properties(ppr)
-            
-            # Extract all runs with complete formatting
-            runs = para_elem.xpath('.//w:r', namespaces=self.NAMESPACES)
-            for run_elem in runs:
-                run_data = self._extract_complete_run_formatting(run_elem)
-                para_data['runs'].append(run_data)
-                para_data['text'] += run_data.get('text', '')
-            
-            # Check for drawings, images, etc.
-            para_data['contains_drawing'] = bool(para_elem.xpath('.//w:drawing', namespaces=self.NAMESPACES))
-            
-            para_data['is_empty'] = len(para_data['text'].strip()) == 0
+        # Identical sectPr/table XML (common across sections) shares one buffer
+        blobs = {}
+        
+        try:
+            with docx_zip.open('word/document.xml') as stream:
+                context = etree.iterparse(stream, events=('start', 'end'), tag=tuple(targets),
+                                          **_ITERPARSE_OPTIONS)
+                
+                for event, elem in context:
+                    bucket = targets[elem.tag]
+                    
+                    if event == 'start':
+                        pending_slots.append(len(bucket))
+                        bucket.append(None)
+                        continue
+                    
+                    slot = pending_slots.pop()
+                    if bucket is paragraphs:
+                        bucket[slot] = self._extract_paragraph_with_full_formatting(slot, elem)
+                    elif bucket is sections:
+                        bucket[slot] = self._extract_section(elem, blobs)
+                    else:
+                        bucket[slot] = self._extract_table(elem, blobs)
+                
+                # Elements are not cleared: the returned dicts keep live references
+                return context.root, paragraphs, sections, tables
+                
+        except (KeyError, etree.XMLSyntaxError):
+            return None, [], [], []
+    
+    def _extract_paragraph_with_full_formatting(self, index: int, para_elem: etree._Element) -> Dict:
+        """Extract a single paragraph with COMPLETE formatting information"""
+        para_data = {
+            'index': index,
+            'xml_element': para_elem,  # Live element; serialize on demand
+            'text': '',
+            'properties': {},
+            'runs': [],
+            'is_empty': False,
+            'contains_drawing': False,
+            'contains_table': False,
+            'style_id': None,
+            'numbering': None
+        }
+        
+        # Extract paragraph properties (pPr is always a direct child of w:p)
+        ppr = para_elem.find(W_PPR)
+        if ppr is not None:
+            para_data['properties'] = self._extract_detailed_paragraph_properties(ppr)
+        
+        # Extract all runs with complete formatting
+        runs = self._XP_R(para_elem)
+        for run_elem in runs:
+            run_data = self._extract_complete_run_formatting(run_elem)
+            para_data['runs'].append(run_data)
+            para_data['text'] += run_data.get('text', '')
             
-            paragraphs.append(para_data)
+            # Drawings, images, etc. always live inside runs
+            if run_data['contains_drawing']:
+                para_data['contains_drawing'] = True
         
-        return paragraphs
+        para_data['is_empty'] = len(para_data['text'].strip()) == 0
+        
+        return para_data
     
     def _extract_detailed_paragraph_properties(self, ppr_elem: etree._Element) -> Dict:
         """Extract detailed paragraph properties"""
@@ -157,50 +314,37 @@ class AdvancedDocumentProcessor:
             'outline_level': None
         }
         
-        # Style reference
-        style_elem = ppr_elem.find('w:pStyle', self.NAMESPACES)
-        if style_elem is not None:
-            props['style'] = style_elem.get(f'{{{self.NAMESPACES["w"]}}}val')
-        
-        # Alignment
-        align_elem = ppr_elem.find('w:jc', self.NAMESPACES)
-        if align_elem is not None:
-            props['alignment'] = align_elem.get(f'{{{self.NAMESPACES["w"]}}}val')
-        
-        # Spacing
-        spacing_elem = ppr_elem.find('w:spacing', self.NAMESPACES)
-        if spacing_elem is not None:
-            props['spacing'] = {
-                'before': spacing_elem.get(f'{{{self.NAMESPACES["w"]}}}before'),
-                'after': spacing_elem.get(f'{{{self.NAMESPACES["w"]}}}after'),
-                'line': spacing_elem.get(f'{{{self.NAMESPACES["w"]}}}line'),
-                'line_rule': spacing_elem.get(f'{{{self.NAMESPACES["w"]}}}lineRule')
-            }
-        
-        # Indentation
-        ind_elem = ppr_elem.find('w:ind', self.NAMESPACES)
-        if ind_elem is not None:
-            props['indentation'] = {
-                'left': ind_elem.get(f'{{{self.NAMESPACES["w"]}}}left'),
-                'right': ind_elem.get(f'{{{self.NAMESPACES["w"]}}}right'),
-                'first_line': ind_elem.get(f'{{{self.NAMESPACES["w"]}}}firstLine'),
-                'hanging': ind_elem.get(f'{{{self.NAMESPACES["w"]}}}hanging')
-            }
-        
-        # Borders (including horizontal lines!)
-        border_elem = ppr_elem.find('w:pBdr', self.NAMESPACES)
-        if border_elem is not None:
-            props['borders'] = self._extract_border_properties(border_elem)
-        
-        # Numbering
-        numpr_elem = ppr_elem.find('w:numPr', self.NAMESPACES)
-        if numpr_elem is not None:
-            props['numbering'] = self._extract_numbering_properties(numpr_elem)
-        
-        # Tabs
-        tabs_elem = ppr_elem.find('w:tabs', self.NAMESPACES)
-        if tabs_elem is not None:
-            props['tabs'] = self._extract_tab_properties(tabs_elem)
+        # Single pass over the pPr children, dispatching on the Clark tag
+        for child in ppr_elem.iterchildren():
+            tag = child.tag
+            
+            if tag == W_PSTYLE:
+                # Style reference
+                props['style'] = child.get(W_VAL)
+            elif tag == W_JC:
+                # Alignment
+                props['alignment'] = child.get(W_VAL)
+            elif tag == W_SPACING:
+                props['spacing'] = {
+                    'before': child.get(W_BEFORE),
+                    'after': child.get(W_AFTER),
+                    'line': child.get(W_LINE),
+                    'line_rule': child.get(W_LINERULE)
+                }
+            elif tag == W_IND:
+                props['indentation'] = {
+                    'left': child.get(W_LEFT),
+                    'right': child.get(W_RIGHT),
+                    'first_line': child.get(W_FIRSTLINE),
+                    'hanging': child.get(W_HANGING)
+                }
+            elif tag == W_PBDR:
+                # Borders (including horizontal lines!)
+                props['borders'] = self._extract_border_properties(child)
+            elif tag == W_NUMPR:
+                props['numbering'] = self._extract_numbering_properties(child)
+            elif tag == W_TABS:
+                props['tabs'] = self._extract_tab_properties(child)
         
         return props
     
@@ -208,15 +352,15 @@ class AdvancedDocumentProcessor:
         """Extract detailed border properties (crucial for horizontal lines)"""
         borders = {}
         
-        for side in ['top', 'left', 'bottom', 'right']:
-            side_elem = border_elem.find(f'w:{side}', self.NAMESPACES)
-            if side_elem is not None:
+        for side_elem in border_elem.iterchildren():
+            side = BORDER_SIDES.get(side_elem.tag)
+            if side is not None:
                 borders[side] = {
-                    'style': side_elem.get(f'{{{self.NAMESPACES["w"]}}}val'),
-                    'size': side_elem.get(f'{{{self.NAMESPACES["w"]}}}sz'),
-                    'space': side_elem.get(f'{{{self.NAMESPACES["w"]}}}space'),
-                    'color': side_elem.get(f'{{{self.NAMESPACES["w"]}}}color'),
-                    'shadow': side_elem.get(f'{{{self.NAMESPACES["w"]}}}shadow')
+                    'style': side_elem.get(W_VAL),
+                    'size': side_elem.get(W_SZ),
+                    'space': side_elem.get(W_SPACE),
+                    'color': side_elem.get(W_COLOR),
+                    'shadow': side_elem.get(W_SHADOW)
                 }
         
         return borders
@@ -227,11 +371,11 @@ class AdvancedDocumentProcessor:
         
         ilvl_elem = numpr_elem.find('w:ilvl', self.NAMESPACES)
         if ilvl_elem is not None:
-            numbering['level'] = ilvl_elem.get(f'{{{self.NAMESPACES["w"]}}}val')
+            numbering['level'] = ilvl_elem.get(W_VAL)
         
         numid_elem = numpr_elem.find('w:numId', self.NAMESPACES)
         if numid_elem is not None:
-            numbering['id'] = numid_elem.get(f'{{{self.NAMESPACES["w"]}}}val')
+            numbering['id'] = numid_elem.get(W_VAL)
         
         return numbering
     
@@ -241,9 +385,9 @@ class AdvancedDocumentProcessor:
         
         for tab_elem in tabs_elem.findall('w:tab', self.NAMESPACES):
             tab_data = {
-                'position': tab_elem.get(f'{{{self.NAMESPACES["w"]}}}pos'),
-                'alignment': tab_elem.get(f'{{{self.NAMESPACES["w"]}}}val'),
-                'leader': tab_elem.get(f'{{{self.NAMESPACES["w"]}}}leader')
+                'position': tab_elem.get(W_POS),
+                'alignment': tab_elem.get(W_VAL),
+                'leader': tab_elem.get(W_LEADER)
             }
             tabs.append(tab_data)
         
@@ -253,26 +397,30 @@ class AdvancedDocumentProcessor:
         """Extract complete run formatting"""
         run_data = {
             'text': '',
-            'xml_element': etree.tostring(run_elem, encoding='unicode'),
+            'xml_element': run_elem,
             'properties': {},
             'is_tab': False,
             'is_break': False,
-            'is_symbol': False
+            'is_symbol': False,
+            'contains_drawing': False
         }
         
-        # Extract text content
-        text_elements = run_elem.findall('w:t', self.NAMESPACES)
-        for text_elem in text_elements:
-            run_data['text'] += text_elem.text or ''
-        
-        # Check for special elements
-        run_data['is_tab'] = bool(run_elem.find('w:tab', self.NAMESPACES))
-        run_data['is_break'] = bool(run_elem.find('w:br', self.NAMESPACES))
-        
-        # Extract run properties
-        rpr = run_elem.find('w:rPr', self.NAMESPACES)
-        if rpr is not None:
-            run_data['properties'] = self._extract_detailed_run_properties(rpr)
+        # Single pass over the run's children: text, special elements, properties
+        for child in run_elem.iterchildren():
+            tag = child.tag
+            
+            if tag == W_T:
+                run_data['text'] += child.text or ''
+            elif tag == W_RPR:
+                run_data['properties'] = self._extract_detailed_run_properties(child)
+            elif tag == W_TAB:
+                run_data['is_tab'] = True
+            elif tag == W_BR:
+                run_data['is_break'] = True
+            elif tag == W_DRAWING:
+                run_data['contains_drawing'] = True
+            elif tag == MC_ALTERNATE_CONTENT and self._XP_DRAWING(child):
+                run_data['contains_drawing'] = True
         
         return run_data
     
@@ -293,103 +441,88 @@ class AdvancedDocumentProcessor:
             'style': None
         }
         
-        # Font information
-        font_elem = rpr_elem.find('w:rFonts', self.NAMESPACES)
-        if font_elem is not None:
-            props['font'] = {
-                'ascii': font_elem.get(f'{{{self.NAMESPACES["w"]}}}ascii'),
-                'hansi': font_elem.get(f'{{{self.NAMESPACES["w"]}}}hAnsi'),
-                'eastAsia': font_elem.get(f'{{{self.NAMESPACES["w"]}}}eastAsia'),
-                'cs': font_elem.get(f'{{{self.NAMESPACES["w"]}}}cs')
-            }
+        # Most runs carry a handful of rPr children at most; skip empty ones outright
+        if not len(rpr_elem):
+            return props
         
-        # Font size
-        sz_elem = rpr_elem.find('w:sz', self.NAMESPACES)
-        if sz_elem is not None:
-            props['size'] = sz_elem.get(f'{{{self.NAMESPACES["w"]}}}val')
+        # Single pass over the rPr children, dispatching on the Clark tag through
+        # lookup tables rather than a long if/elif chain of string compares
+        val_keys = RUN_VAL_PROPERTIES
+        toggle_keys = RUN_TOGGLE_PROPERTIES
         
-        # Color
-        color_elem = rpr_elem.find('w:color', self.NAMESPACES)
-        if color_elem is not None:
-            props['color'] = color_elem.get(f'{{{self.NAMESPACES["w"]}}}val')
-        
-        # Bold, Italic, etc.
-        props['bold'] = rpr_elem.find('w:b', self.NAMESPACES) is not None
-        props['italic'] = rpr_elem.find('w:i', self.NAMESPACES) is not None
-        props['strike'] = rpr_elem.find('w:strike', self.NAMESPACES) is not None
-        
-        # Underline
-        u_elem = rpr_elem.find('w:u', self.NAMESPACES)
-        if u_elem is not None:
-            props['underline'] = u_elem.get(f'{{{self.NAMESPACES["w"]}}}val')
-        
-        # Highlight
-        highlight_elem = rpr_elem.find('w:highlight', self.NAMESPACES)
-        if highlight_elem is not None:
-            props['highlight'] = highlight_elem.get(f'{{{self.NAMESPACES["w"]}}}val')
+        for child in rpr_elem.iterchildren():
+            tag = child.tag
+            
+            key = val_keys.get(tag)
+            if key is not None:
+                props[key] = child.get(W_VAL)
+                continue
+            
+            key = toggle_keys.get(tag)
+            if key is not None:
+                # Toggles may be present but switched off, e.g. <w:b w:val="0"/>
+                props[key] = child.get(W_VAL) not in OFF_VALUES
+            elif tag == W_RFONTS:
+                # Font information
+                props['font'] = {
+                    'ascii': child.get(W_ASCII),
+                    'hansi': child.get(W_HANSI),
+                    'eastAsia': child.get(W_EASTASIA),
+                    'cs': child.get(W_CS)
+                }
         
         return props
     
-    def _extract_sections(self, document_xml: etree._Element) -> List[Dict]:
+    def _extract_section(self, sect_elem: etree._Element, blobs: Dict[bytes, bytes]) -> Dict:
         """Extract section properties"""
-        sections = []
-        
-        sect_elements = document_xml.xpath('.//w:sectPr', namespaces=self.NAMESPACES)
-        for sect_elem in sect_elements:
-            section_data = {
-                'xml_element': etree.tostring(sect_elem, encoding='unicode'),
-                'page_size': {},
-                'margins': {},
-                'headers_footers': {},
-                'columns': {},
-                'page_numbers': {}
-            }
-            
-            # Extract detailed section properties
-            # This would include page margins, headers, footers, etc.
-            sections.append(section_data)
-        
-        return sections
+        # Extract detailed section properties
+        # This would include page margins, headers, footers, etc.
+        return {
+            'xml_element': _serialize_interned(sect_elem, blobs),
+            'page_size': {},
+            'margins': {},
+            'headers_footers': {},
+            'columns': {},
+            'page_numbers': {}
+        }
     
-    def _extract_tables(self, document_xml: etree._Element) -> List[Dict]:
-        """Extract table structures with complete formatting"""
-        tables = []
-        
-        table_elements = document_xml.xpath('.//w:tbl', namespaces=self.NAMESPACES)
-        for table_elem in table_elements:
-            table_data = {
-                'xml_element': etree.tostring(table_elem, encoding='unicode'),
-                'properties': {},
-                'rows': []
-            }
-            
-            # Extract table properties and rows
-            # This would include borders, cell formatting, etc.
-            tables.append(table_data)
-        
-        return tables
+    def _extract_table(self, table_elem: etree._Element, blobs: Dict[bytes, bytes]) -> Dict:
+        """Extract a table structure with complete formatting"""
+        # Extract table properties and rows
+        # This would include borders, cell formatting, etc.
+        return {
+            'xml_element': _serialize_interned(table_elem, blobs),
+            'properties': {},
+            'rows': []
+        }
     
-    def _extract_headers_footers(self, docx_zip: zipfile.ZipFile) -> List[Dict]:
+    def _extract_headers_footers(self, docx_path: str, name_map: Dict[str, zipfile.ZipInfo],
+                                 pool: ThreadPoolExecutor) -> List[Dict]:
         """Extract headers and footers"""
         headers_footers = []
-        
-        # Look for header/footer files
-        for file_info in docx_zip.filelist:
-            if 'header' in file_info.filename or 'footer' in file_info.filename:
-                xml_content = self._read_xml_file(docx_zip, file_info.filename)
-                if xml_content is not None:
-                    headers_footers.append({
-                        'filename': file_info.filename,
-                        'xml_element': etree.tostring(xml_content, encoding='unicode')
-                    })
+        blobs = {}
+        
+        # Look for header/footer files, then parse all candidates in parallel
+        candidates = [
+            (file_info, pool.submit(self._with_zip, docx_path, self._read_xml_file, file_info))
+            for name, file_info in name_map.items()
+            if name.startswith(self.HEADER_FOOTER_PREFIXES) and name.endswith('.xml')
+        ]
+        
+        for file_info, future in candidates:
+            xml_content = future.result()
+            if xml_content is not None:
+                headers_footers.append({
+                    'filename': file_info.filename,
+                    'xml_element': _serialize_interned(xml_content, blobs)
+                })
         
         return headers_footers
     
     def _extract_paragraph_properties(self, para_elem: etree._Element) -> Dict:
         """Legacy method for compatibility"""
-        return self._extract_detailed_paragraph_properties(
-            para_elem.find('w:pPr', self.NAMESPACES)
-        ) if para_elem.find('w:pPr', self.NAMESPACES) is not None else {}
+        ppr = para_elem.find(W_PPR)
+        return self._extract_detailed_paragraph_properties(ppr) if ppr is not None else {}
 
 # Legacy compatibility
 DocumentProcessor = AdvancedDocumentProcessor
\ No newline at end of file
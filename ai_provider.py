@@ -3,9 +3,21 @@ import json
 import os
 from typing import Optional
 from dotenv import load_dotenv
-from openai import OpenAI
-from config import *
+from openai import OpenAI, BadRequestError, RateLimitError
+from config import (
+    AI_PROVIDER, GEMINI_MODEL, OLLAMA_MODEL, OLLAMA_URL, OPENAI_MODEL,
+    SYSTEM_PROMPT, TEMPERATURE, MAX_RETRIES, MAX_RETRY_DELAY, TIMEOUT_SECONDS
+)
 import time
+import random
+
+# orjson decodes bytes directly and is much faster on Ollama's many small
+# streamed JSON lines; fall back to the stdlib decoder when it's missing
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 # Load environment variables
 load_dotenv()
@@ -16,6 +28,19 @@ class AIProvider:
     def __init__(self):
         self.provider = AI_PROVIDER.lower()
         
+        # One keep-alive session for all HTTP calls (Ollama and Gemini), so
+        # retries and warmup checks reuse the same connection pool
+        self._session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=2, pool_maxsize=2)
+        self._session.mount('http://', adapter)
+        
+        # Set once Ollama is confirmed running with the model pulled
+        self._ollama_ready = False
+        
+        # Response cache statistics, updated by llm_cache.cached_generate
+        self.cache_hits = 0
+        self.cache_misses = 0
+        
         if self.provider == "gemini":
             api_key = os.getenv('GEMINI_API_KEY')
             if not api_key:
@@ -35,7 +60,7 @@ class AIProvider:
     def is_ollama_available(self) -> bool:
         """Check if Ollama is running locally"""
         try:
-            response = requests.get(f"{OLLAMA_URL}/api/tags", timeout=5)
+            response = self._session.get(f"{OLLAMA_URL}/api/tags", timeout=5)
             return response.status_code == 200
         except:
             return False
@@ -44,16 +69,16 @@ class AIProvider:
         """Ensure the Ollama model is downloaded"""
         try:
             # Check if model exists
-            response = requests.get(f"{OLLAMA_URL}/api/tags", timeout=10)
+            response = self._session.get(f"{OLLAMA_URL}/api/tags", timeout=10)
             if response.status_code == 200:
-                models = response.json().get('models', [])
-                model_names = [model['name'].split(':')[0] for model in models]
+                models = _json_loads(response.content).get('models', [])
+                model_names = {model['name'].split(':')[0] for model in models}
                 
                 if OLLAMA_MODEL not in model_names:
                     print(f"📥 Downloading {OLLAMA_MODEL} model (this may take a few minutes)...")
                     # Pull the model
                     pull_data = {"name": OLLAMA_MODEL}
-                    response = requests.post(f"{OLLAMA_URL}/api/pull", json=pull_data, timeout=600)
+                    response = self._session.post(f"{OLLAMA_URL}/api/pull", json=pull_data, timeout=600)
                     if response.status_code != 200:
                         return False
                     print(f"✅ {OLLAMA_MODEL} model ready!")
@@ -74,7 +99,8 @@ Current Resume:
 
 Please tailor this resume for the job description above."""
 
-        for attempt in range(MAX_RETRIES):
+        max_retries = MAX_RETRIES
+        for attempt in range(max_retries):
             try:
                 if self.provider == "gemini":
                     return self._generate_gemini_response(user_message)
@@ -82,20 +108,39 @@ Please tailor this resume for the job description above."""
                     return self._generate_ollama_response(user_message)
                 else:  # openai
                     return self._generate_openai_response(user_message)
+            except BadRequestError as e:
+                # The request itself was rejected - retrying can't help
+                print(f"❌ Request rejected by OpenAI: {e}")
+                return None
             except Exception as e:
                 print(f"⚠️  Attempt {attempt + 1} failed: {e}")
-                if attempt < MAX_RETRIES - 1:
-                    time.sleep(2)  # Wait before retry
+                if attempt < max_retries - 1:
+                    time.sleep(self._retry_delay(attempt, e))  # Wait before retry
                 
         return None
     
+    @staticmethod
+    def _retry_delay(attempt: int, error: Exception) -> float:
+        """Capped exponential backoff with jitter, honoring Retry-After on rate limits"""
+        if isinstance(error, RateLimitError):
+            retry_after = error.response.headers.get('retry-after')
+            try:
+                return min(float(retry_after), MAX_RETRY_DELAY)
+            except (TypeError, ValueError):
+                pass
+        
+        return min(2 ** attempt + random.random(), MAX_RETRY_DELAY)
+    
     def _generate_ollama_response(self, user_message: str) -> Optional[str]:
         """Generate response using local Ollama"""
-        if not self.is_ollama_available():
-            raise Exception("Ollama is not running. Please start Ollama first.")
-        
-        if not self.ensure_ollama_model():
-            raise Exception(f"Could not set up {OLLAMA_MODEL} model")
+        if not self._ollama_ready:
+            if not self.is_ollama_available():
+                raise Exception("Ollama is not running. Please start Ollama first.")
+            
+            if not self.ensure_ollama_model():
+                raise Exception(f"Could not set up {OLLAMA_MODEL} model")
+            
+            self._ollama_ready = True
         
         # Prepare request
         data = {
@@ -104,17 +149,35 @@ Please tailor this resume for the job description above."""
                 {"role": "system", "content": SYSTEM_PROMPT},
                 {"role": "user", "content": user_message}
             ],
-            "stream": False
+            "stream": True,
+            "options": {"temperature": TEMPERATURE}
         }
         
         print("🤖 Processing with local AI...")
-        response = requests.post(f"{OLLAMA_URL}/api/chat", json=data, timeout=TIMEOUT_SECONDS)
+        try:
+            response = self._session.post(f"{OLLAMA_URL}/api/chat", json=data, stream=True, timeout=TIMEOUT_SECONDS)
+        except requests.ConnectionError:
+            # Ollama went away - re-check availability on the next attempt
+            self._ollama_ready = False
+            raise
         
-        if response.status_code == 200:
-            result = response.json()
-            return result['message']['content']
-        else:
-            raise Exception(f"Ollama request failed: {response.status_code}")
+        with response:
+            if response.status_code != 200:
+                raise Exception(f"Ollama request failed: {response.status_code}")
+            
+            # Ollama streams one JSON object per line; collect chunks as they arrive
+            chunks = []
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                result = _json_loads(line)
+                if 'error' in result:
+                    raise Exception(f"Ollama request failed: {result['error']}")
+                chunks.append(result.get('message', {}).get('content', ''))
+                if result.get('done'):
+                    break
+        
+        return ''.join(chunks)
     
     def _generate_openai_response(self, user_message: str) -> Optional[str]:
         """Generate response using OpenAI API"""
@@ -127,7 +190,7 @@ Please tailor this resume for the job description above."""
                 {"role": "user", "content": user_message}
             ],
             max_tokens=4000,
-            temperature=0.7
+            temperature=TEMPERATURE
         )
         
         return response.choices[0].message.content
@@ -149,7 +212,7 @@ Please tailor this resume for the job description above."""
                 }
             ],
             "generationConfig": {
-                "temperature": 0.7,
+                "temperature": TEMPERATURE,
                 "topK": 40,
                 "topP": 0.95,
                 "maxOutputTokens": 4000,
@@ -175,10 +238,10 @@ Please tailor this resume for the job description above."""
         }
         
         # Make request
-        response = requests.post(url, json=data, timeout=TIMEOUT_SECONDS)
+        response = self._session.post(url, json=data, timeout=TIMEOUT_SECONDS)
         
         if response.status_code == 200:
-            result = response.json()
+            result = _json_loads(response.content)
             if "candidates" in result and len(result["candidates"]) > 0:
                 candidate = result["candidates"][0]
                 if "content" in candidate and "parts" in candidate["content"]:
@@ -187,6 +250,15 @@ Please tailor this resume for the job description above."""
         else:
             raise Exception(f"Gemini API request failed: {response.status_code} - {response.text}")
     
+    @property
+    def model(self) -> str:
+        """Name of the model the active provider uses"""
+        if self.provider == "gemini":
+            return GEMINI_MODEL
+        elif self.provider == "ollama":
+            return OLLAMA_MODEL
+        return OPENAI_MODEL
+    
     def get_provider_info(self) -> str:
         """Get information about current AI provider"""
         if self.provider == "gemini":
@@ -1,33 +1,38 @@
 # Configuration for SkillBridge
 # You can modify these settings to customize the behavior
 
+from typing import Final
+
 # FOLDER SETTINGS
 # Default watch folder (change this path if you want to watch a different location)
-WATCH_FOLDER = "./TailorResumeInbox"
+WATCH_FOLDER: Final[str] = "./TailorResumeInbox"
+# Seconds between folder scans when polling is used instead of native change
+# notifications (Windows and network drives, where those are unreliable)
+WATCH_INTERVAL: Final[int] = 5
 
 # OUTPUT SETTINGS
-OUTPUT_FILENAME = "TailoredResume.docx"
-ERROR_FILENAME = "Error.docx"
+OUTPUT_FILENAME: Final[str] = "TailoredResume.docx"
+ERROR_FILENAME: Final[str] = "Error.docx"
 
 # AI PROVIDER SETTINGS
 # Options: "gemini" (Google AI), "openai" (OpenAI API), or "ollama" (free, local)
-AI_PROVIDER = "gemini"
+AI_PROVIDER: Final[str] = "gemini"
 
 # GEMINI SETTINGS (Google AI)
 # Create a .env file and add: GEMINI_API_KEY=your_api_key_here
-GEMINI_MODEL = "gemini-1.5-flash"  # Options: gemini-1.5-pro, gemini-1.5-flash (flash has higher free limits)
+GEMINI_MODEL: Final[str] = "gemini-1.5-flash"  # Options: gemini-1.5-pro, gemini-1.5-flash (flash has higher free limits)
 
 # OLLAMA SETTINGS (for local AI)
-OLLAMA_MODEL = "llama3.1"  # Options: llama3.1, mistral, phi3
-OLLAMA_URL = "http://localhost:11434"
+OLLAMA_MODEL: Final[str] = "llama3.1"  # Options: llama3.1, mistral, phi3
+OLLAMA_URL: Final[str] = "http://localhost:11434"
 
 # OPENAI SETTINGS (optional, for premium experience)
 # Create a .env file and add: OPENAI_API_KEY=your_api_key_here
-OPENAI_MODEL = "gpt-4o"
+OPENAI_MODEL: Final[str] = "gpt-4o"
 
 # RESUME TAILORING PROMPT
 # This is the core instruction for the AI - modify this to improve results
-SYSTEM_PROMPT = """You are an expert resume tailoring specialist. Your job is to take a job description and a resume, then rewrite the resume to be perfectly tailored for that specific job while maintaining 100% truthfulness.
+SYSTEM_PROMPT: Final[str] = """You are an expert resume tailoring specialist. Your job is to take a job description and a resume, then rewrite the resume to be perfectly tailored for that specific job while maintaining 100% truthfulness.
 
 Your goals:
 1. Match keywords from the job description naturally
@@ -55,6 +60,12 @@ Rules:
 Input format: You'll receive the job description first, then the current resume.
 Output: Return only the tailored resume content with identical structure to the original."""
 
+# Sampling temperature for the AI. Only repeatable (0) requests use the response
+# cache below, so it is off by default; set TEMPERATURE: Final[float] = 0 to turn it on
+TEMPERATURE: Final[float] = 0.7
+
 # PROCESSING SETTINGS
-MAX_RETRIES = 3
-TIMEOUT_SECONDS = 300  # 5 minutes max per AI request
\ No newline at end of file
+MAX_RETRIES: Final[int] = 3
+MAX_RETRY_DELAY: Final[int] = 30  # Upper bound (seconds) for the backoff between retries
+TIMEOUT_SECONDS: Final[int] = 300  # 5 minutes max per AI request
+RESPONSE_CACHE_DAYS: Final[int] = 30  # Keep cached AI responses this long (0 disables the cache; needs TEMPERATURE 0)
\ No newline at end of file
@@ -1,6 +1,6 @@
 import sys
 import subprocess
-import importlib.util
+from importlib.metadata import distribution, PackageNotFoundError
 from typing import List, Tuple
 
 def check_and_install_dependencies() -> bool:
@@ -19,6 +19,11 @@ def check_and_install_dependencies() -> bool:
         ('lxml', 'lxml>=4.6.0')  # Critical for 100% formatting preservation
     ]
     
+    # Speed-ups with a pure-Python fallback; never installed automatically
+    optional_packages = [
+        ('orjson', 'orjson>=3.9')  # Fast JSON decoding for AI responses
+    ]
+    
     missing_packages = []
     
     print("🔍 Checking dependencies...")
@@ -33,66 +38,77 @@ def check_and_install_dependencies() -> bool:
     if missing_packages:
         print(f"\n📦 Installing {len(missing_packages)} missing dependencies...")
         
-        for package in missing_packages:
-            success = _install_package(package)
-            if not success:
-                print(f"❌ Failed to install {package}")
-                print("Please run: pip3 install -r requirements.txt")
-                return False
+        # Single pip run for everything; retry one-by-one only to pinpoint a failure
+        if not _install_packages(missing_packages):
+            for package in missing_packages:
+                success = _install_package(package)
+                if not success:
+                    print(f"❌ Failed to install {package}")
+                    print("Please run: pip3 install -r requirements.txt")
+                    return False
         
         print("✅ All dependencies installed successfully!")
     else:
         print("✅ All dependencies are already installed!")
     
+    _report_optional_packages(optional_packages)
+    
     return True
 
+def _report_optional_packages(optional_packages: List[Tuple[str, str]]):
+    """Print an install hint for each missing optional package; SkillBridge runs without them"""
+    for package_name, _ in optional_packages:
+        if not _is_package_installed(package_name):
+            print(f"   💡 Optional: pip install {package_name} (faster, not required)")
+
 def _is_package_installed(package_name: str) -> bool:
-    """Check if a package is installed"""
+    """Check if a package is installed by reading its metadata (no import side effects)"""
     
-    # Handle special cases
-    package_map = {
-        'docx': 'docx',
-        'dotenv': 'dotenv',
-        'lxml': 'lxml'
+    # Map import names to distribution names where they differ
+    distribution_map = {
+        'docx': 'python-docx',
+        'dotenv': 'python-dotenv'
     }
     
-    import_name = package_map.get(package_name, package_name)
+    distribution_name = distribution_map.get(package_name, package_name)
     
     try:
-        spec = importlib.util.find_spec(import_name)
-        return spec is not None
-    except (ImportError, ValueError, ModuleNotFoundError):
+        distribution(distribution_name)
+        return True
+    except PackageNotFoundError:
         return False
 
-def _install_package(package: str) -> bool:
-    """Install a package using pip"""
+def _install_packages(packages: List[str]) -> bool:
+    """Install several packages with a single pip invocation"""
     try:
-        print(f"   📥 Installing {package}...")
+        print(f"   📥 Installing {', '.join(packages)}...")
+        
+        # Run pip for this interpreter - avoids pip/pip3 PATH mismatches
+        result = subprocess.run(
+            [sys.executable, '-m', 'pip', 'install', *packages, '--user'],
+            capture_output=True,
+            text=True,
+            timeout=300
+        )
         
-        # Try pip3 first, then pip
-        for pip_cmd in ['pip3', 'pip']:
-            try:
-                result = subprocess.run(
-                    [pip_cmd, 'install', package, '--user'], 
-                    capture_output=True, 
-                    text=True, 
-                    timeout=120
-                )
-                
-                if result.returncode == 0:
-                    print(f"   ✅ {package} installed successfully!")
-                    return True
-                    
-            except (subprocess.TimeoutExpired, FileNotFoundError):
-                continue
+        if result.returncode == 0:
+            print(f"   ✅ {', '.join(packages)} installed successfully!")
+            return True
         
-        print(f"   ❌ Failed to install {package}")
+        print(f"   ❌ Failed to install {', '.join(packages)}")
         return False
         
+    except subprocess.TimeoutExpired:
+        print(f"   ❌ Timed out installing {', '.join(packages)}")
+        return False
     except Exception as e:
-        print(f"   ❌ Error installing {package}: {e}")
+        print(f"   ❌ Error installing {', '.join(packages)}: {e}")
         return False
 
+def _install_package(package: str) -> bool:
+    """Install a single package using pip"""
+    return _install_packages([package])
+
 def check_advanced_features() -> Tuple[bool, str]:
     """
     Check if advanced XML processing is available
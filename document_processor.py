@@ -1,13 +1,14 @@
 import os
 from docx import Document
-from docx.shared import Inches, Pt, RGBColor
-from docx.enum.text import WD_ALIGN_PARAGRAPH, WD_LINE_SPACING
-from docx.enum.style import WD_STYLE_TYPE
+from docx.enum.text import WD_ALIGN_PARAGRAPH, WD_UNDERLINE
+from docx.shared import Emu
 from docx.oxml.ns import qn
-from docx.oxml import OxmlElement
-from typing import Optional, Dict, List, Tuple
+from typing import Optional, Dict, List, Tuple, Iterator, Iterable, Union
 import re
-from copy import deepcopy
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from lxml import etree
 
 # Import our advanced XML processing system
 try:
@@ -17,26 +18,199 @@ except ImportError:
     ADVANCED_XML_AVAILABLE = False
     print("⚠️  Advanced XML processing not available, using basic mode")
 
+# Line classifiers used by the fallback formatter, built once at import
+_HEADING_KEYWORDS = frozenset([
+    'professional summary', 'summary', 'objective', 'profile',
+    'work experience', 'experience', 'employment history',
+    'education', 'skills', 'technical skills', 'core competencies',
+    'certifications', 'awards', 'projects', 'achievements'
+])
+
+# One case-insensitive scan for any heading keyword instead of a
+# substring test per keyword against a lowercased copy
+_HEADING_RE = re.compile('|'.join(re.escape(h) for h in sorted(_HEADING_KEYWORDS)), re.I)
+
+_BULLET_PREFIX = ('•', '-', '*')
+
+# The same tailored text is often formatted more than once (XML
+# reconstruction -> structure preservation -> fallback), so the regex-backed
+# heading check is memoized on the line itself. The subheading and bullet
+# checks are plain substring/prefix tests and cheaper than a cache lookup.
+@lru_cache(maxsize=4096)
+def _is_heading_text(text: str) -> bool:
+    return len(text) < 50 and _HEADING_RE.search(text) is not None
+
+def _is_subheading_text(text: str) -> bool:
+    # Job title/company separators: "Title | Company", "Company - Title",
+    # "Title at Company"; each `in` is a C-level substring search
+    return len(text) < 100 and ('|' in text or '-' in text or 'at ' in text)
+
+# Tags for the streaming text extractor, resolved once at import
+_W_BODY = qn('w:body')
+_W_P = qn('w:p')
+_W_R = qn('w:r')
+_W_HYPERLINK = qn('w:hyperlink')
+_W_T = qn('w:t')
+_W_BR = qn('w:br')
+_W_TBL = qn('w:tbl')
+_W_TBLGRID = qn('w:tblGrid')
+_W_GRIDCOL = qn('w:gridCol')
+_W_TR = qn('w:tr')
+_W_TC = qn('w:tc')
+_W_TCPR = qn('w:tcPr')
+_W_GRIDSPAN = qn('w:gridSpan')
+_W_VMERGE = qn('w:vMerge')
+_W_VAL = qn('w:val')
+_W_TYPE = qn('w:type')
+
+# w:rPr children written directly by _apply_run_formatting
+_W_RPR = qn('w:rPr')
+_W_RFONTS = qn('w:rFonts')
+_W_ASCII = qn('w:ascii')
+_W_HANSI = qn('w:hAnsi')
+_W_B = qn('w:b')
+_W_I = qn('w:i')
+_W_COLOR = qn('w:color')
+_W_SZ = qn('w:sz')
+_W_U = qn('w:u')
+
+# Run children with a fixed text equivalent (w:br depends on its type)
+_RUN_TEXT_EQUIVALENTS = {
+    qn('w:tab'): '\t',
+    qn('w:ptab'): '\t',
+    qn('w:cr'): '\n',
+    qn('w:noBreakHyphen'): '-',
+}
+
+# python-docx streams the zip in many small writes; coalesce them so saves
+# to network-mounted output folders are not dominated by per-write latency
+_SAVE_BUFFER_SIZE = 1024 * 1024
+
+_ITERPARSE_OPTIONS = {'resolve_entities': False, 'huge_tree': True, 'remove_comments': True}
+
+def _iter_lines(text: str) -> Iterator[str]:
+    """Yield the same pieces as text.split('\\n') without building the list"""
+    start = 0
+    find = text.find
+    while True:
+        end = find('\n', start)
+        if end < 0:
+            yield text[start:]
+            return
+        yield text[start:end]
+        start = end + 1
+
+def _preload_batch_worker():
+    """Import python-docx and lxml up front in each batch worker process"""
+    import docx
+    import lxml.etree
+
+def _run_tailoring_job(job: Tuple[str, str, str]) -> bool:
+    """Process-pool entry point for one (original path, content, output path) job"""
+    return DocumentProcessor.create_tailored_resume(*job)
+
 class DocumentProcessor:
     """Handles reading and writing Word documents while preserving formatting"""
     
     @staticmethod
-    def extract_text_from_docx(file_path: str) -> Optional[str]:
+    def _paragraph_text(p_elem) -> str:
+        """Text of a w:p element, matching python-docx Paragraph.text"""
+        parts = []
+        for child in p_elem:
+            if child.tag == _W_R:
+                runs = (child,)
+            elif child.tag == _W_HYPERLINK:
+                runs = child.iterchildren(_W_R)
+            else:
+                continue
+            for run in runs:
+                for item in run:
+                    tag = item.tag
+                    if tag == _W_T:
+                        parts.append(item.text or '')
+                    elif tag == _W_BR:
+                        if item.get(_W_TYPE, 'textWrapping') == 'textWrapping':
+                            parts.append('\n')
+                    elif tag in _RUN_TEXT_EQUIVALENTS:
+                        parts.append(_RUN_TEXT_EQUIVALENTS[tag])
+        return ''.join(parts)
+    
+    @staticmethod
+    def _table_cell_texts(tbl_elem) -> List[str]:
+        """Cell texts of a w:tbl in layout-grid order, repeating spanned cells"""
+        grid = tbl_elem.find(_W_TBLGRID)
+        col_count = len(grid.findall(_W_GRIDCOL)) if grid is not None else 0
+        rows = tbl_elem.findall(_W_TR)
+        paragraph_text = DocumentProcessor._paragraph_text
+        cells = []
+        for tr in rows:
+            for tc in tr.iterchildren(_W_TC):
+                tc_pr = tc.find(_W_TCPR)
+                grid_span, v_merge = 1, None
+                if tc_pr is not None:
+                    span = tc_pr.find(_W_GRIDSPAN)
+                    if span is not None:
+                        grid_span = int(span.get(_W_VAL))
+                    merge = tc_pr.find(_W_VMERGE)
+                    if merge is not None:
+                        v_merge = merge.get(_W_VAL, 'continue')
+                # str.join materializes its argument anyway; a list
+                # comprehension skips the generator frame per paragraph
+                text = '\n'.join([paragraph_text(p) for p in tc.iterchildren(_W_P)])
+                for span_idx in range(grid_span):
+                    if v_merge == 'continue':
+                        cells.append(cells[-col_count])
+                    elif span_idx > 0:
+                        cells.append(cells[-1])
+                    else:
+                        cells.append(text)
+        return cells[:len(rows) * col_count]
+    
+    @staticmethod
+    def _iter_text(file_path: Union[str, os.PathLike]) -> Iterator[str]:
+        """Stream paragraph text, then table cell text, straight from document.xml
+        
+        Read-only counterpart of walking Document(file_path).paragraphs and
+        .tables: body-level elements are cleared as soon as they are consumed
+        so the tree never has to be held in memory as a whole.
+        """
+        table_texts = []
+        with zipfile.ZipFile(file_path) as docx_zip, docx_zip.open('word/document.xml') as xml_file:
+            for _, elem in etree.iterparse(xml_file, tag=(_W_P, _W_TBL), **_ITERPARSE_OPTIONS):
+                parent = elem.getparent()
+                if parent is None or parent.tag != _W_BODY:
+                    continue  # nested; consumed with its body-level ancestor
+                if elem.tag == _W_P:
+                    yield DocumentProcessor._paragraph_text(elem)
+                else:
+                    # python-docx lists table text after all body paragraphs
+                    table_texts.extend(DocumentProcessor._table_cell_texts(elem))
+                elem.clear()
+                while elem.getprevious() is not None:
+                    del parent[0]
+        yield from table_texts
+    
+    @staticmethod
+    def extract_text_from_docx(file_path: Union[str, os.PathLike]) -> Optional[str]:
         """Extract text content from a Word document"""
         try:
-            doc = Document(file_path)
-            full_text = []
-            
-            for paragraph in doc.paragraphs:
-                full_text.append(paragraph.text)
-            
-            # Also extract text from tables
-            for table in doc.tables:
-                for row in table.rows:
-                    for cell in row.cells:
-                        full_text.append(cell.text)
-            
-            return '\n'.join(full_text)
+            return '\n'.join(DocumentProcessor._iter_text(file_path))
+        except Exception as e:
+            print(f"❌ Error reading document {file_path}: {e}")
+            return None
+    
+    @staticmethod
+    def extract_text_head(file_path: Union[str, os.PathLike], max_chars: int) -> Optional[str]:
+        """Extract at most max_chars of text, stopping once enough has been read"""
+        try:
+            parts = []
+            total = 0
+            for text in DocumentProcessor._iter_text(file_path):
+                if total > max_chars:
+                    break
+                parts.append(text)
+                total += len(text) + 1  # include the newline separator
+            return '\n'.join(parts)[:max_chars]
         except Exception as e:
             print(f"❌ Error reading document {file_path}: {e}")
             return None
@@ -45,48 +219,75 @@ class DocumentProcessor:
     def extract_document_structure(file_path: str) -> Optional[List[Dict]]:
         """Extract detailed structure and formatting from document"""
         try:
-            doc = Document(file_path)
-            structure = []
-            
-            for para in doc.paragraphs:
-                para_info = {
-                    'text': para.text,
-                    'style': para.style.name if para.style else 'Normal',
-                    'alignment': para.alignment,
-                    'space_before': para.paragraph_format.space_before,
-                    'space_after': para.paragraph_format.space_after,
-                    'line_spacing': para.paragraph_format.line_spacing,
-                    'first_line_indent': para.paragraph_format.first_line_indent,
-                    'left_indent': para.paragraph_format.left_indent,
-                    'right_indent': para.paragraph_format.right_indent,
-                    'runs': []
-                }
-                
-                # Extract run-level formatting
-                for run in para.runs:
-                    run_info = {
-                        'text': run.text,
-                        'bold': run.bold,
-                        'italic': run.italic,
-                        'underline': run.underline,
-                        'font_name': run.font.name,
-                        'font_size': run.font.size,
-                        'font_color': run.font.color.rgb if run.font.color.rgb else None,
-                        'highlight_color': run.font.highlight_color,
-                    }
-                    para_info['runs'].append(run_info)
-                
-                structure.append(para_info)
-            
-            return structure
+            return DocumentProcessor.extract_document_structure_from_doc(Document(file_path))
         except Exception as e:
             print(f"❌ Error extracting structure from {file_path}: {e}")
             return None
     
     @staticmethod
-    def create_tailored_resume(original_resume_path: str, tailored_content: str, output_path: str) -> bool:
+    def extract_document_structure_from_doc(doc: Document) -> List[Dict]:
+        """Extract detailed structure and formatting from an already-loaded document"""
+        structure = []
+        
+        for para in doc.paragraphs:
+            # Each style/paragraph_format/font access builds a new proxy
+            # object, so resolve them once per paragraph and run
+            style = para.style
+            pf = para.paragraph_format
+            runs = []
+            
+            # Extract run-level formatting
+            for run in para.runs:
+                font = run.font
+                rgb = font.color.rgb
+                runs.append({
+                    'text': run.text,
+                    'bold': run.bold,
+                    'italic': run.italic,
+                    'underline': run.underline,
+                    'font_name': font.name,
+                    'font_size': font.size,
+                    'font_color': rgb if rgb else None,
+                    'highlight_color': font.highlight_color,
+                })
+            
+            structure.append({
+                'text': para.text,
+                'style': style.name if style else 'Normal',
+                'alignment': para.alignment,
+                'space_before': pf.space_before,
+                'space_after': pf.space_after,
+                'line_spacing': pf.line_spacing,
+                'first_line_indent': pf.first_line_indent,
+                'left_indent': pf.left_indent,
+                'right_indent': pf.right_indent,
+                'runs': runs
+            })
+        
+        return structure
+    
+    @staticmethod
+    def create_tailored_resume(original_resume_path: Union[str, os.PathLike], tailored_content: str,
+                               output_path: Union[str, os.PathLike]) -> bool:
         """Create a new resume with tailored content while preserving 100% identical formatting"""
         
+        # Build the document under a temporary name and move it into place
+        # only once complete, so a watcher or reader never sees a partial file
+        temp_path = f"{os.fspath(output_path)}.tmp.{os.getpid()}"
+        try:
+            success = DocumentProcessor._write_tailored_resume(original_resume_path, tailored_content, temp_path)
+            if success:
+                os.replace(temp_path, output_path)
+            return success
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+    
+    @staticmethod
+    def _write_tailored_resume(original_resume_path: Union[str, os.PathLike], tailored_content: str,
+                               output_path: str) -> bool:
+        """Write the tailored resume to output_path, trying each formatting strategy in turn"""
+        
         # Try advanced XML reconstruction first (for 100% formatting preservation)
         if ADVANCED_XML_AVAILABLE:
             try:
@@ -110,8 +311,12 @@ class DocumentProcessor:
         try:
             print("📋 Using structure preservation method...")
             
+            # Parse the original once; both structure extraction and
+            # document-settings copying work from the same loaded Document
+            original_doc = Document(original_resume_path)
+            
             # Extract the original document structure
-            original_structure = DocumentProcessor.extract_document_structure(original_resume_path)
+            original_structure = DocumentProcessor.extract_document_structure_from_doc(original_doc)
             if not original_structure:
                 raise Exception("Could not extract original document structure")
             
@@ -128,8 +333,8 @@ class DocumentProcessor:
             print("🎨 Creating formatted document...")
             
             # Create new document with original formatting
-            success = DocumentProcessor._create_formatted_document(
-                original_resume_path, mapped_structure, output_path
+            success = DocumentProcessor._create_formatted_document_from_doc(
+                original_doc, mapped_structure, output_path
             )
             
             if success:
@@ -145,7 +350,7 @@ class DocumentProcessor:
             return DocumentProcessor._create_fallback_document(tailored_content, output_path)
     
     @staticmethod
-    def create_error_document(error_message: str, output_path: str) -> bool:
+    def create_error_document(error_message: str, output_path: Union[str, os.PathLike]) -> bool:
         """Create an error document with the error message"""
         try:
             doc = Document()
@@ -180,56 +385,70 @@ class DocumentProcessor:
             footer = doc.add_paragraph('If the problem persists, please check the console for detailed error messages.')
             footer.runs[0].italic = True
             
-            doc.save(output_path)
+            DocumentProcessor._save_document(doc, output_path)
             return True
             
         except Exception as e:
             print(f"❌ Error creating error document: {e}")
             return False
     
+    @staticmethod
+    def create_tailored_resumes_batch(jobs: List[Tuple[str, str, str]]) -> List[bool]:
+        """Create several tailored resumes in parallel, one worker process per core
+        
+        Each job is (original_resume_path, tailored_content, output_path) and is
+        independent of the others; results are returned in job order.
+        """
+        if not jobs:
+            return []
+        
+        max_workers = min(len(jobs), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_preload_batch_worker) as pool:
+            return list(pool.map(_run_tailoring_job, jobs))
+    
+    @staticmethod
+    def _save_document(doc: Document, output_path: str):
+        """Save a document through a large write buffer"""
+        with open(output_path, 'wb', buffering=_SAVE_BUFFER_SIZE) as output_file:
+            doc.save(output_file)
+    
     @staticmethod
     def _map_content_to_structure(original_structure: List[Dict], new_content: List[str]) -> List[Dict]:
         """Map new content lines to original document structure"""
         mapped = []
+        content_count = len(new_content)
         content_index = 0
+        update_runs = DocumentProcessor._update_runs_with_text
         
         for orig_para in original_structure:
-            if content_index >= len(new_content):
+            if content_index >= content_count:
                 break
             
-            orig_text = orig_para['text'].strip()
-            
             # Skip empty paragraphs in original
-            if not orig_text:
+            if not orig_para['text'].strip():
                 mapped.append(orig_para)  # Keep empty paragraphs for spacing
                 continue
             
-            # Map content to structure
-            new_para = deepcopy(orig_para)
-            
-            if content_index < len(new_content):
-                new_text = new_content[content_index]
-                new_para['text'] = new_text
-                
-                # Update runs with new text while preserving formatting
-                if new_para['runs']:
-                    # Distribute text across runs proportionally
-                    new_para['runs'] = DocumentProcessor._update_runs_with_text(
-                        new_para['runs'], new_text
-                    )
-                
-                content_index += 1
-            
-            mapped.append(new_para)
+            # Map content to structure; the run dicts are rebuilt by
+            # _update_runs_with_text, so only the top level is copied here
+            new_text = new_content[content_index]
+            orig_runs = orig_para['runs']
+            mapped.append({
+                **orig_para,
+                'text': new_text,
+                # Distribute text across runs proportionally
+                'runs': update_runs(orig_runs, new_text) if orig_runs else [],
+            })
+            content_index += 1
         
         # Add any remaining content as new paragraphs with last paragraph's style
-        while content_index < len(new_content):
-            if mapped:
-                last_style = deepcopy(mapped[-1])
-                last_style['text'] = new_content[content_index]
-                last_style['runs'] = [{'text': new_content[content_index], 'bold': False, 'italic': False}]
-                mapped.append(last_style)
-            content_index += 1
+        if mapped:
+            for new_text in new_content[content_index:]:
+                mapped.append({
+                    **mapped[-1],
+                    'text': new_text,
+                    'runs': [{'text': new_text, 'bold': False, 'italic': False}],
+                })
         
         return mapped
     
@@ -240,45 +459,33 @@ class DocumentProcessor:
             return [{'text': new_text, 'bold': False, 'italic': False}]
         
         # If single run, replace text
-        if len(original_runs) == 1:
-            new_run = deepcopy(original_runs[0])
-            new_run['text'] = new_text
-            return [new_run]
+        run_count = len(original_runs)
+        if run_count == 1:
+            return [{**original_runs[0], 'text': new_text}]
         
         # Multiple runs - try to preserve formatting patterns
         new_runs = []
         words = new_text.split()
-        words_per_run = max(1, len(words) // len(original_runs))
+        words_per_run = max(1, len(words) // run_count)
+        last_index = run_count - 1
         
-        word_index = 0
         for i, run in enumerate(original_runs):
-            new_run = deepcopy(run)
-            
-            # Assign words to this run
-            if i == len(original_runs) - 1:
-                # Last run gets remaining words
-                run_words = words[word_index:]
-            else:
-                run_words = words[word_index:word_index + words_per_run]
-                word_index += words_per_run
-            
-            new_run['text'] = ' '.join(run_words) if run_words else ''
-            if new_run['text']:  # Only add non-empty runs
-                new_runs.append(new_run)
+            # Assign words to this run; the last run gets remaining words
+            start = i * words_per_run
+            run_words = words[start:] if i == last_index else words[start:start + words_per_run]
+            if run_words:  # Only add non-empty runs
+                new_runs.append({**run, 'text': ' '.join(run_words)})
         
         return new_runs if new_runs else [{'text': new_text, 'bold': False, 'italic': False}]
     
     @staticmethod
-    def _create_formatted_document(original_path: str, structure: List[Dict], output_path: str) -> bool:
+    def _create_formatted_document_from_doc(original_doc: Document, structure: List[Dict], output_path: str) -> bool:
         """Create a new document with the mapped structure and formatting"""
         try:
-            # Load original document to copy styles and settings
-            original_doc = Document(original_path)
-            
             # Create new document with same core settings
             new_doc = Document()
             
-            # Copy document-level settings
+            # Copy document-level settings from the already-loaded original
             DocumentProcessor._copy_document_settings(original_doc, new_doc)
             
             # Create paragraphs with preserved formatting
@@ -288,18 +495,20 @@ class DocumentProcessor:
                 # Apply paragraph formatting
                 DocumentProcessor._apply_paragraph_formatting(new_para, para_info)
                 
-                # Add runs with formatting
+                # Add runs with formatting, built directly on the w:p element
                 if para_info['runs']:
+                    p_elem = new_para._p
                     for run_info in para_info['runs']:
                         if run_info['text']:
-                            run = new_para.add_run(run_info['text'])
-                            DocumentProcessor._apply_run_formatting(run, run_info)
+                            r_elem = p_elem.add_r()
+                            DocumentProcessor._apply_run_formatting(r_elem, run_info)
+                            r_elem.text = run_info['text']
                 else:
                     # Fallback: add text as single run
                     if para_info['text']:
                         new_para.add_run(para_info['text'])
             
-            new_doc.save(output_path)
+            DocumentProcessor._save_document(new_doc, output_path)
             return True
             
         except Exception as e:
@@ -344,21 +553,48 @@ class DocumentProcessor:
             pass  # Continue even if some formatting can't be applied
     
     @staticmethod
-    def _apply_run_formatting(run, run_info: Dict):
-        """Apply run-level formatting (font, bold, italic, etc.)"""
+    def _apply_run_formatting(r_elem, run_info: Dict):
+        """Apply run-level formatting (font, bold, italic, etc.) to a bare w:r
+        
+        Writes the w:rPr children directly, in schema order, rather than
+        assigning through the Run/Font proxies, which re-walk w:rPr on every
+        property. Must be called before the run's text is set so w:rPr ends
+        up as the first child.
+        """
         try:
-            if run_info.get('bold') is not None:
-                run.bold = run_info['bold']
-            if run_info.get('italic') is not None:
-                run.italic = run_info['italic']
-            if run_info.get('underline') is not None:
-                run.underline = run_info['underline']
-            if run_info.get('font_name'):
-                run.font.name = run_info['font_name']
-            if run_info.get('font_size'):
-                run.font.size = run_info['font_size']
-            if run_info.get('font_color'):
-                run.font.color.rgb = run_info['font_color']
+            font_name = run_info.get('font_name')
+            bold = run_info.get('bold')
+            italic = run_info.get('italic')
+            font_color = run_info.get('font_color')
+            font_size = run_info.get('font_size')
+            underline = run_info.get('underline')
+            if not (font_name or font_color or font_size
+                    or bold is not None or italic is not None or underline is not None):
+                return
+            
+            rpr = etree.SubElement(r_elem, _W_RPR)
+            if font_name:
+                rfonts = etree.SubElement(rpr, _W_RFONTS)
+                rfonts.set(_W_ASCII, font_name)
+                rfonts.set(_W_HANSI, font_name)
+            if bold is not None:
+                b = etree.SubElement(rpr, _W_B)
+                if not bold:
+                    b.set(_W_VAL, '0')
+            if italic is not None:
+                i = etree.SubElement(rpr, _W_I)
+                if not italic:
+                    i.set(_W_VAL, '0')
+            if font_color:
+                etree.SubElement(rpr, _W_COLOR).set(_W_VAL, str(font_color))
+            if font_size:
+                etree.SubElement(rpr, _W_SZ).set(_W_VAL, str(int(Emu(font_size).pt * 2)))
+            if underline is not None:
+                if underline is True:
+                    underline = WD_UNDERLINE.SINGLE
+                elif underline is False:
+                    underline = WD_UNDERLINE.NONE
+                etree.SubElement(rpr, _W_U).set(_W_VAL, WD_UNDERLINE.to_xml(underline))
         except:
             pass  # Continue even if some formatting can't be applied
     
@@ -368,59 +604,62 @@ class DocumentProcessor:
         try:
             doc = Document()
             
-            # Split content into paragraphs and add with basic formatting
-            paragraphs = content.split('\n')
+            # One writer per line kind, so each line is classified exactly once
+            writers = {
+                'blank': lambda text: doc.add_paragraph(),  # Empty paragraph for spacing
+                'heading': lambda text: doc.add_heading(text, level=1),
+                'subheading': lambda text: doc.add_heading(text, level=2),
+                'bullet': lambda text: doc.add_paragraph(text, style='List Bullet'),
+                'paragraph': lambda text: DocumentProcessor._apply_smart_formatting(doc.add_paragraph(text))
+            }
             
-            for para_text in paragraphs:
-                para_text = para_text.strip()
-                if not para_text:
-                    doc.add_paragraph()  # Empty paragraph for spacing
-                    continue
-                
-                # Apply basic smart formatting
-                if DocumentProcessor._is_heading(para_text):
-                    heading = doc.add_heading(para_text, level=1)
-                elif DocumentProcessor._is_subheading(para_text):
-                    subheading = doc.add_heading(para_text, level=2)
-                elif DocumentProcessor._is_bullet_point(para_text):
-                    doc.add_paragraph(para_text, style='List Bullet')
-                else:
-                    para = doc.add_paragraph(para_text)
-                    DocumentProcessor._apply_smart_formatting(para)
+            # Add paragraphs with basic smart formatting as they are classified
+            for kind, para_text in DocumentProcessor._iter_classified_lines(_iter_lines(content)):
+                writers[kind](para_text)
             
-            doc.save(output_path)
+            DocumentProcessor._save_document(doc, output_path)
             return True
             
         except Exception as e:
             print(f"❌ Error creating fallback document: {e}")
             return False
     
+    @staticmethod
+    def _iter_classified_lines(lines: Iterable[str]) -> Iterator[Tuple[str, str]]:
+        """Strip and classify raw lines in one pass, yielding (kind, text)"""
+        classify = DocumentProcessor._classify_line
+        for line in lines:
+            text = line.strip()
+            yield (classify(text) if text else 'blank'), text
+    
+    @staticmethod
+    def _classify_line(text: str) -> str:
+        """Classify a line as 'heading', 'subheading', 'bullet' or 'paragraph'"""
+        # Most resume lines are long bullets; gate the memoized checks on
+        # length here so those lines neither hit nor fill the caches
+        length = len(text)
+        if length < 50 and _is_heading_text(text):
+            return 'heading'
+        if length < 100 and _is_subheading_text(text):
+            return 'subheading'
+        if DocumentProcessor._is_bullet_point(text):
+            return 'bullet'
+        return 'paragraph'
+    
     @staticmethod
     def _is_heading(text: str) -> bool:
         """Determine if text should be formatted as a main heading"""
-        headings = [
-            'professional summary', 'summary', 'objective', 'profile',
-            'work experience', 'experience', 'employment history',
-            'education', 'skills', 'technical skills', 'core competencies',
-            'certifications', 'awards', 'projects', 'achievements'
-        ]
-        return any(heading in text.lower() for heading in headings) and len(text) < 50
+        return _is_heading_text(text)
     
     @staticmethod
     def _is_subheading(text: str) -> bool:
         """Determine if text should be formatted as a subheading (job title/company)"""
-        # Look for patterns like "Job Title | Company Name" or "Company Name - Job Title"
-        patterns = [
-            r'.*\|.*',  # Contains pipe
-            r'.*-.*',   # Contains dash
-            r'.*at .*', # Contains "at"
-        ]
-        return any(re.match(pattern, text) for pattern in patterns) and len(text) < 100
+        return _is_subheading_text(text)
     
     @staticmethod
     def _is_bullet_point(text: str) -> bool:
         """Determine if text should be formatted as a bullet point"""
-        return text.startswith('•') or text.startswith('-') or text.startswith('*')
+        return text.startswith(_BULLET_PREFIX)
     
     @staticmethod
     def _apply_smart_formatting(paragraph):
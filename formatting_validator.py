@@ -3,26 +3,88 @@ Precision formatting validator to ensure perfect resume formatting
 """
 
 from lxml import etree
-from typing import Dict, List, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 import re
+from collections import Counter
+from itertools import islice
+from advanced_xml_processor import OFF_VALUES
+
+# Issue keyword -> recommendation, in the order recommendations are reported
+_ISSUE_RECOMMENDATIONS = {
+    'alignment': 'Consider preserving original paragraph alignment settings',
+    'indentation': 'Verify indentation values are copied exactly from original',
+    'spacing': 'Check that line spacing and paragraph spacing match original',
+    'borders': 'Ensure paragraph borders and horizontal lines are preserved',
+    'bold': 'Verify bold formatting is applied consistently',
+    'italic': 'Check italic formatting preservation',
+    'numbering': 'Preserve original numbering and bullet point formatting'
+}
+
+# Zero-width lookahead so overlapping mentions ("borderspacing") all match
+_ISSUE_RE = re.compile(
+    '(?=(%s))' % '|'.join(re.escape(pattern) for pattern in _ISSUE_RECOMMENDATIONS),
+    re.IGNORECASE
+)
+
+# Number of leading runs whose formatting is compared per paragraph
+_RUNS_COMPARED = 3
+
+# Paragraph properties compared against the modified paragraph's pPr
+_PPR_CHECKED_PROPERTIES = ('alignment', 'numbering', 'indentation', 'spacing', 'borders', 'shading')
 
 class FormattingValidator:
     """
     Validates that formatting has been perfectly preserved
     """
     
+    # Attributes are read for every paragraph and run; slots keep those
+    # loads off the instance dict
+    __slots__ = (
+        'namespaces',
+        '_tag_r', '_tag_ppr', '_tag_rpr', '_tag_jc', '_tag_numpr', '_tag_b', '_tag_i',
+        '_tag_sz', '_tag_ind', '_tag_spacing', '_tag_pbdr', '_tag_shd',
+        '_border_tags', '_attr_val', '_attrs',
+    )
+    
     def __init__(self, namespaces: Dict[str, str]):
         self.namespaces = namespaces
+        
+        # Expand tag names once; find() and iter() with a Clark name skip
+        # per-call prefix resolution and XPath evaluation
+        w = namespaces['w']
+        self._tag_r = f'{{{w}}}r'
+        self._tag_ppr = f'{{{w}}}pPr'
+        self._tag_rpr = f'{{{w}}}rPr'
+        self._tag_jc = f'{{{w}}}jc'
+        self._tag_numpr = f'{{{w}}}numPr'
+        self._tag_b = f'{{{w}}}b'
+        self._tag_i = f'{{{w}}}i'
+        self._tag_sz = f'{{{w}}}sz'
+        self._tag_ind = f'{{{w}}}ind'
+        self._tag_spacing = f'{{{w}}}spacing'
+        self._tag_pbdr = f'{{{w}}}pBdr'
+        self._tag_shd = f'{{{w}}}shd'
+        self._border_tags = [(side, f'{{{w}}}{side}') for side in ['top', 'bottom', 'left', 'right']]
+        self._attr_val = f'{{{w}}}val'
+        self._attrs = {
+            attr: f'{{{w}}}{attr}'
+            for attr in ('left', 'right', 'firstLine', 'hanging', 'before', 'after', 'line')
+        }
     
     def validate_formatting_preservation(self, original_paragraphs: List[Dict], 
-                                       modified_paragraphs: List[etree._Element]) -> Dict:
+                                       modified_paragraphs: List[etree._Element],
+                                       detailed: bool = True) -> Dict:
         """
         Comprehensive validation of formatting preservation
+        
+        With detailed=False the per-paragraph matches and issue strings are
+        not kept; only the score, issue counts and recommendations are filled.
         """
         validation_results = {
             'overall_score': 0.0,
             'issues_found': [],
             'formatting_matches': [],
+            'issue_counts': Counter(),
             'recommendations': []
         }
         
@@ -31,6 +93,9 @@ class FormattingValidator:
             
             total_checks = 0
             passed_checks = 0
+            formatting_matches = validation_results['formatting_matches']
+            issues_found = validation_results['issues_found']
+            issue_counts = validation_results['issue_counts']
             
             # Compare each paragraph
             for i, (original, modified) in enumerate(zip(original_paragraphs, modified_paragraphs)):
@@ -38,25 +103,26 @@ class FormattingValidator:
                     original, modified, i
                 )
                 
-                validation_results['formatting_matches'].append({
-                    'paragraph_index': i,
-                    'score': paragraph_score,
-                    'issues': issues
-                })
+                if detailed:
+                    formatting_matches.append({
+                        'paragraph_index': i,
+                        'score': paragraph_score,
+                        'issues': issues
+                    })
                 
                 total_checks += 1
                 if paragraph_score >= 0.95:  # 95% threshold for "perfect"
                     passed_checks += 1
                 else:
-                    validation_results['issues_found'].extend(issues)
+                    issue_counts.update(self._issue_categories(issues))
+                    if detailed:
+                        issues_found.extend(issues)
             
             # Calculate overall score
             validation_results['overall_score'] = (passed_checks / total_checks) if total_checks > 0 else 0.0
             
             # Generate recommendations
-            validation_results['recommendations'] = self._generate_recommendations(
-                validation_results['issues_found']
-            )
+            validation_results['recommendations'] = self._generate_recommendations(issue_counts)
             
             print(f"📊 Formatting validation score: {validation_results['overall_score']:.1%}")
             
@@ -71,100 +137,156 @@ class FormattingValidator:
         """
         Validate formatting for a single paragraph
         """
-        issues = []
-        checks_passed = 0
-        total_checks = 0
+        # Look up pPr and the runs once and index pPr's children by tag, so
+        # the sub-checks share one child scan instead of a find() per property.
+        # Most body paragraphs have nothing at paragraph level to compare, in
+        # which case pPr is not touched at all.
+        original_props = original.get('properties', {})
+        if original_props and any(original_props.get(key) for key in _PPR_CHECKED_PROPERTIES):
+            ppr, ppr_children = self._index_paragraph_properties(modified)
+        else:
+            ppr, ppr_children = None, {}
+        # Only the leading runs are compared, so stop collecting after those
+        modified_runs = list(islice(modified.iter(self._tag_r), _RUNS_COMPARED)) if original.get('runs') else []
         
-        # Check paragraph properties
-        para_score, para_issues = self._check_paragraph_properties(original, modified)
-        issues.extend(para_issues)
-        checks_passed += para_score
-        total_checks += 1
-        
-        # Check run formatting
-        run_score, run_issues = self._check_run_formatting(original, modified)
-        issues.extend(run_issues)
-        checks_passed += run_score
-        total_checks += 1
-        
-        # Check indentation and spacing
-        indent_score, indent_issues = self._check_indentation_spacing(original, modified)
-        issues.extend(indent_issues)
-        checks_passed += indent_score
-        total_checks += 1
-        
-        # Check borders and shading
-        border_score, border_issues = self._check_borders_shading(original, modified)
-        issues.extend(border_issues)
-        checks_passed += border_score
-        total_checks += 1
+        # A failure in any sub-check marks the whole paragraph as partially
+        # validated rather than aborting the document
+        try:
+            # Check alignment/numbering, indentation/spacing and borders/shading
+            (para_score, indent_score, border_score), issues = self._check_paragraph_level(
+                original, ppr, ppr_children
+            )
+            
+            # Check run formatting
+            run_score, run_issues = self._check_run_formatting(original, modified_runs)
+            issues.extend(run_issues)
+        except Exception as e:
+            return 0.5, [f"Error validating paragraph {index}: {e}"]
         
-        final_score = checks_passed / total_checks if total_checks > 0 else 0.0
+        # Four equally weighted checks: the three property groups and the runs
+        final_score = (para_score + run_score + indent_score + border_score) / 4
         return final_score, issues
     
-    def _check_paragraph_properties(self, original: Dict, 
-                                  modified: etree._Element) -> Tuple[float, List[str]]:
-        """Check paragraph-level properties"""
+    def _index_paragraph_properties(self, modified: etree._Element) -> Tuple[Optional[etree._Element], Dict]:
+        """Return the paragraph's pPr and its children keyed by tag"""
+        ppr = modified.find(self._tag_ppr)
+        if ppr is None:
+            return None, {}
+        # Walk in reverse so the first occurrence of a tag wins, as with find()
+        return ppr, {child.tag: child for child in reversed(ppr)}
+    
+    def _check_paragraph_level(self, original: Dict, ppr: Optional[etree._Element],
+                             ppr_children: Dict) -> Tuple[Tuple[float, float, float], List[str]]:
+        """
+        Check paragraph-level properties against the indexed pPr
+        
+        Returns one score each for alignment/numbering, indentation/spacing
+        and borders/shading, plus the issues found across all three.
+        """
+        original_props = original.get('properties', {})
+        if ppr is None:
+            # Nothing to compare against, so every group passes
+            return (1.0, 1.0, 1.0), []
+        
         issues = []
-        score = 1.0
         
-        try:
-            original_props = original.get('properties', {})
-            
-            # Get modified paragraph properties
-            ppr = modified.find('w:pPr', self.namespaces)
-            
-            # Check alignment
-            original_alignment = original_props.get('alignment')
-            if original_alignment and ppr is not None:
-                jc_elem = ppr.find('w:jc', self.namespaces)
-                if jc_elem is not None:
-                    modified_alignment = jc_elem.get(f'{{{self.namespaces["w"]}}}val')
-                    if original_alignment != modified_alignment:
-                        issues.append(f"Alignment mismatch: {original_alignment} vs {modified_alignment}")
-                        score -= 0.2
-                elif original_alignment != 'left':  # Default is left
-                    issues.append(f"Missing alignment: expected {original_alignment}")
-                    score -= 0.2
-            
-            # Check numbering
-            original_numbering = original_props.get('numbering')
-            if original_numbering and ppr is not None:
-                num_pr = ppr.find('w:numPr', self.namespaces)
-                if num_pr is None:
-                    issues.append("Missing numbering properties")
-                    score -= 0.3
+        # Check alignment
+        para_score = 1.0
+        original_alignment = original_props.get('alignment')
+        if original_alignment:
+            jc_elem = ppr_children.get(self._tag_jc)
+            if jc_elem is not None:
+                modified_alignment = jc_elem.get(self._attr_val)
+                if original_alignment != modified_alignment:
+                    issues.append(f"Alignment mismatch: {original_alignment} vs {modified_alignment}")
+                    para_score -= 0.2
+            elif original_alignment != 'left':  # Default is left
+                issues.append(f"Missing alignment: expected {original_alignment}")
+                para_score -= 0.2
+        
+        # Check numbering
+        if original_props.get('numbering') and ppr_children.get(self._tag_numpr) is None:
+            issues.append("Missing numbering properties")
+            para_score -= 0.3
+        
+        # Check indentation
+        indent_score = 1.0
+        attrs = self._attrs
+        original_indent = original_props.get('indentation', {})
+        if original_indent:
+            ind_elem = ppr_children.get(self._tag_ind)
             
-            return max(0.0, score), issues
+            for indent_attr in ['left', 'right', 'firstLine', 'hanging']:
+                original_value = original_indent.get(indent_attr)
+                if original_value:
+                    if ind_elem is not None:
+                        modified_value = ind_elem.get(attrs[indent_attr])
+                        if str(original_value) != str(modified_value):
+                            issues.append(f"Indentation mismatch ({indent_attr}): {original_value} vs {modified_value}")
+                            indent_score -= 0.25
+                    else:
+                        issues.append(f"Missing indentation element for {indent_attr}")
+                        indent_score -= 0.25
+        
+        # Check spacing
+        original_spacing = original_props.get('spacing', {})
+        if original_spacing:
+            spacing_elem = ppr_children.get(self._tag_spacing)
             
-        except Exception as e:
-            return 0.5, [f"Error checking paragraph properties: {e}"]
+            for spacing_attr in ['before', 'after', 'line']:
+                original_value = original_spacing.get(spacing_attr)
+                if original_value:
+                    if spacing_elem is not None:
+                        modified_value = spacing_elem.get(attrs[spacing_attr])
+                        if str(original_value) != str(modified_value):
+                            issues.append(f"Spacing mismatch ({spacing_attr}): {original_value} vs {modified_value}")
+                            indent_score -= 0.25
+                    else:
+                        issues.append(f"Missing spacing element for {spacing_attr}")
+                        indent_score -= 0.25
+        
+        # Check borders
+        border_score = 1.0
+        original_borders = original_props.get('borders')
+        if original_borders:
+            pBdr = ppr_children.get(self._tag_pbdr)
+            if pBdr is None:
+                issues.append("Missing paragraph borders")
+                border_score -= 0.5
+            else:
+                # Check specific border properties against one scan of pBdr
+                border_children = {child.tag: child for child in reversed(pBdr)}
+                for border_side, border_tag in self._border_tags:
+                    if border_side in original_borders:
+                        border_elem = border_children.get(border_tag)
+                        if border_elem is None:
+                            issues.append(f"Missing {border_side} border")
+                            border_score -= 0.25
+        
+        # Check shading
+        if original_props.get('shading') and ppr_children.get(self._tag_shd) is None:
+            issues.append("Missing paragraph shading")
+            border_score -= 0.3
+        
+        return (max(0.0, para_score), max(0.0, indent_score), max(0.0, border_score)), issues
     
     def _check_run_formatting(self, original: Dict, 
-                            modified: etree._Element) -> Tuple[float, List[str]]:
+                            modified_runs: List[etree._Element]) -> Tuple[float, List[str]]:
         """Check run-level formatting"""
         issues = []
         score = 1.0
         
-        try:
-            original_runs = original.get('runs', [])
-            modified_runs = modified.xpath('.//w:r', namespaces=self.namespaces)
-            
-            if len(original_runs) != len(modified_runs):
-                # This might be OK if content changed but formatting is preserved
-                # We'll check if formatting patterns are maintained
-                pass
-            
-            # Check key formatting properties in the first few runs
-            for i, original_run in enumerate(original_runs[:3]):  # Check first 3 runs
-                if i < len(modified_runs):
-                    run_score = self._compare_run_formatting(original_run, modified_runs[i])
-                    score *= run_score
-            
-            return max(0.0, score), issues
-            
-        except Exception as e:
-            return 0.5, [f"Error checking run formatting: {e}"]
+        original_runs = original.get('runs', [])
+        
+        # Run counts may differ when content changed but formatting is
+        # preserved, so only the formatting patterns of the first few
+        # runs are checked
+        # modified_runs holds at most _RUNS_COMPARED runs, so zip stops there
+        for original_run, modified_run in zip(original_runs, modified_runs):
+            run_score = self._compare_run_formatting(original_run, modified_run)
+            score *= run_score
+        
+        return max(0.0, score), issues
     
     def _compare_run_formatting(self, original_run: Dict, 
                               modified_run: etree._Element) -> float:
@@ -173,145 +295,62 @@ class FormattingValidator:
         original_props = original_run.get('properties', {})
         
         # Get modified run properties
-        rpr = modified_run.find('w:rPr', self.namespaces)
+        rpr = modified_run.find(self._tag_rpr)
+        
+        # A plain run matches an original with no bold/italic/size to verify
+        if rpr is None and not original_props:
+            return 1.0
+        
+        # Collect bold/italic/size from one scan of rPr's children instead
+        # of a find() per property
+        modified_bold = modified_italic = False
+        sz_elem = None
+        if rpr is not None:
+            tag_b, tag_i, tag_sz = self._tag_b, self._tag_i, self._tag_sz
+            attr_val = self._attr_val
+            for child in rpr:
+                tag = child.tag
+                # Toggles can be present but off (<w:b w:val="0"/>), as the extractor reads them
+                if tag == tag_b:
+                    modified_bold = child.get(attr_val) not in OFF_VALUES
+                elif tag == tag_i:
+                    modified_italic = child.get(attr_val) not in OFF_VALUES
+                elif tag == tag_sz and sz_elem is None:
+                    sz_elem = child
         
         score = 1.0
         
         # Check bold
         original_bold = original_props.get('bold', False)
-        modified_bold = rpr is not None and rpr.find('w:b', self.namespaces) is not None
-        
         if original_bold != modified_bold:
             score -= 0.3
         
         # Check italic
         original_italic = original_props.get('italic', False)
-        modified_italic = rpr is not None and rpr.find('w:i', self.namespaces) is not None
-        
         if original_italic != modified_italic:
             score -= 0.3
         
         # Check font size
         original_size = original_props.get('size')
-        if original_size and rpr is not None:
-            sz_elem = rpr.find('w:sz', self.namespaces)
-            if sz_elem is not None:
-                modified_size = sz_elem.get(f'{{{self.namespaces["w"]}}}val')
-                if original_size != modified_size:
-                    score -= 0.2
+        if original_size and sz_elem is not None:
+            modified_size = sz_elem.get(self._attr_val)
+            if original_size != modified_size:
+                score -= 0.2
         
         return max(0.0, score)
     
-    def _check_indentation_spacing(self, original: Dict, 
-                                 modified: etree._Element) -> Tuple[float, List[str]]:
-        """Check indentation and spacing properties"""
-        issues = []
-        score = 1.0
-        
-        try:
-            original_props = original.get('properties', {})
-            
-            # Get paragraph properties
-            ppr = modified.find('w:pPr', self.namespaces)
-            
-            # Check indentation
-            original_indent = original_props.get('indentation', {})
-            if original_indent and ppr is not None:
-                ind_elem = ppr.find('w:ind', self.namespaces)
-                
-                for indent_attr in ['left', 'right', 'firstLine', 'hanging']:
-                    original_value = original_indent.get(indent_attr)
-                    if original_value:
-                        if ind_elem is not None:
-                            modified_value = ind_elem.get(f'{{{self.namespaces["w"]}}}{indent_attr}')
-                            if str(original_value) != str(modified_value):
-                                issues.append(f"Indentation mismatch ({indent_attr}): {original_value} vs {modified_value}")
-                                score -= 0.25
-                        else:
-                            issues.append(f"Missing indentation element for {indent_attr}")
-                            score -= 0.25
-            
-            # Check spacing
-            original_spacing = original_props.get('spacing', {})
-            if original_spacing and ppr is not None:
-                spacing_elem = ppr.find('w:spacing', self.namespaces)
-                
-                for spacing_attr in ['before', 'after', 'line']:
-                    original_value = original_spacing.get(spacing_attr)
-                    if original_value:
-                        if spacing_elem is not None:
-                            modified_value = spacing_elem.get(f'{{{self.namespaces["w"]}}}{spacing_attr}')
-                            if str(original_value) != str(modified_value):
-                                issues.append(f"Spacing mismatch ({spacing_attr}): {original_value} vs {modified_value}")
-                                score -= 0.25
-                        else:
-                            issues.append(f"Missing spacing element for {spacing_attr}")
-                            score -= 0.25
-            
-            return max(0.0, score), issues
-            
-        except Exception as e:
-            return 0.5, [f"Error checking indentation/spacing: {e}"]
-    
-    def _check_borders_shading(self, original: Dict, 
-                             modified: etree._Element) -> Tuple[float, List[str]]:
-        """Check borders and shading"""
-        issues = []
-        score = 1.0
-        
-        try:
-            original_props = original.get('properties', {})
-            
-            # Get paragraph properties
-            ppr = modified.find('w:pPr', self.namespaces)
-            
-            # Check borders
-            original_borders = original_props.get('borders')
-            if original_borders and ppr is not None:
-                pBdr = ppr.find('w:pBdr', self.namespaces)
-                if pBdr is None:
-                    issues.append("Missing paragraph borders")
-                    score -= 0.5
-                else:
-                    # Check specific border properties
-                    for border_side in ['top', 'bottom', 'left', 'right']:
-                        if border_side in original_borders:
-                            border_elem = pBdr.find(f'w:{border_side}', self.namespaces)
-                            if border_elem is None:
-                                issues.append(f"Missing {border_side} border")
-                                score -= 0.25
-            
-            # Check shading
-            original_shading = original_props.get('shading')
-            if original_shading and ppr is not None:
-                shd_elem = ppr.find('w:shd', self.namespaces)
-                if shd_elem is None:
-                    issues.append("Missing paragraph shading")
-                    score -= 0.3
-            
-            return max(0.0, score), issues
-            
-        except Exception as e:
-            return 0.5, [f"Error checking borders/shading: {e}"]
+    def _issue_categories(self, issues: List[str]) -> Iterator[str]:
+        """Yield the recommendation pattern of every keyword found in the issues"""
+        for issue in issues:
+            for match in _ISSUE_RE.finditer(issue):
+                yield match.group(1).lower()
     
-    def _generate_recommendations(self, issues: List[str]) -> List[str]:
-        """Generate recommendations based on found issues"""
-        recommendations = []
-        
-        issue_patterns = {
-            'alignment': 'Consider preserving original paragraph alignment settings',
-            'indentation': 'Verify indentation values are copied exactly from original',
-            'spacing': 'Check that line spacing and paragraph spacing match original',
-            'borders': 'Ensure paragraph borders and horizontal lines are preserved',
-            'bold': 'Verify bold formatting is applied consistently',
-            'italic': 'Check italic formatting preservation',
-            'numbering': 'Preserve original numbering and bullet point formatting'
-        }
-        
-        for pattern, recommendation in issue_patterns.items():
-            if any(pattern.lower() in issue.lower() for issue in issues):
-                if recommendation not in recommendations:
-                    recommendations.append(recommendation)
+    def _generate_recommendations(self, issue_counts: Counter) -> List[str]:
+        """Generate recommendations based on found issue categories"""
+        recommendations = [
+            recommendation for pattern, recommendation in _ISSUE_RECOMMENDATIONS.items()
+            if pattern in issue_counts
+        ]
         
         if not recommendations:
             recommendations.append("Formatting appears to be well preserved!")
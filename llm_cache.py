@@ -0,0 +1,76 @@
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+from config import SYSTEM_PROMPT, RESPONSE_CACHE_DAYS
+
+# Content-addressed store of previous AI responses, one JSON file per request
+CACHE_DIR = Path.home() / ".skillbridge" / "cache"
+
+def _cache_key(provider_name: str, model: str, temperature: float,
+               job_description: str, resume_content: str) -> str:
+    """Hash everything that determines the AI response"""
+    payload = json.dumps({
+        "p": provider_name,
+        "m": model,
+        "t": temperature,
+        "s": SYSTEM_PROMPT,
+        "jd": job_description,
+        "r": resume_content,
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def _load(path: Path) -> Optional[str]:
+    """Return a cached response if present and not expired"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    # A hand-edited or corrupt file may hold any JSON value; treat it as a miss
+    if not isinstance(entry, dict):
+        return None
+    ts = entry.get("ts", 0)
+    if not isinstance(ts, (int, float)) or time.time() - ts > RESPONSE_CACHE_DAYS * 86400:
+        return None
+    response = entry.get("response")
+    return response if isinstance(response, str) else None
+
+def _store(path: Path, response: str):
+    """Persist a response; a failed write only costs a future cache miss"""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.tmp.{os.getpid()}")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"response": response, "ts": time.time()}, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"⚠️  Could not cache AI response: {e}")
+
+def cached_generate(provider, job_description: str, resume_content: str,
+                    model: str, temperature: float) -> Optional[str]:
+    """
+    provider.generate_response with a disk cache for deterministic requests
+
+    Only temperature 0 requests are cached; with sampling enabled, dropping
+    the same files again is how a user asks for a different result.
+    """
+    if temperature > 0 or RESPONSE_CACHE_DAYS <= 0:
+        return provider.generate_response(job_description, resume_content)
+
+    path = CACHE_DIR / f"{_cache_key(provider.provider, model, temperature, job_description, resume_content)}.json"
+    response = _load(path)
+    if response is not None:
+        provider.cache_hits += 1
+        print("⚡ Using cached AI response for this job description and resume")
+        return response
+
+    provider.cache_misses += 1
+    response = provider.generate_response(job_description, resume_content)
+    if response:
+        _store(path, response)
+    return response
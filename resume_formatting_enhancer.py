@@ -2,40 +2,101 @@
 Advanced formatting preservation utilities for perfect resume formatting
 """
 
+import logging
 import re
-from typing import Dict, List, Tuple, Optional
+from itertools import islice
+from typing import Any, Dict, List, Tuple, Optional
 from lxml import etree
 
+# Diagnostic detail goes to debug logging; the one-line step announcements
+# stay on stdout with the rest of the CLI output
+logger = logging.getLogger(__name__)
+
+# "Title | Company", "Title at Company", "Title - Company", in split priority
+_JOB_TITLE_SEPARATORS = (' | ', ' at ', ' - ')
+_JOB_TITLE_SEPARATOR_RE = re.compile('|'.join(re.escape(sep) for sep in _JOB_TITLE_SEPARATORS))
+
+class ParaMapping:
+    """How one original paragraph (or one extra AI line) maps to new content"""
+    
+    # Built once per paragraph and read by every enhancement pass
+    __slots__ = (
+        'original_index', 'new_content', 'preserve_exact', 'original_content',
+        'properties', 'runs', 'xml_element', 'content_type', 'structure_hints',
+    )
+    
+    def __init__(self, original_index: int, new_content: str, preserve_exact: bool = False,
+                 original_content: str = '', properties: Optional[Dict] = None,
+                 runs: Optional[List[Dict]] = None, xml_element: Any = None,
+                 content_type: str = 'paragraph', structure_hints: Optional[Dict] = None):
+        self.original_index = original_index
+        self.new_content = new_content
+        self.preserve_exact = preserve_exact
+        self.original_content = original_content
+        self.properties = properties
+        self.runs = runs
+        self.xml_element = xml_element
+        self.content_type = content_type
+        self.structure_hints = structure_hints
+
 class ResumeFormattingEnhancer:
     """
     Specialized class for handling resume-specific formatting requirements
     """
     
+    # Everything __init__ sets; no per-instance dict is needed
+    __slots__ = (
+        'namespaces',
+        '_tag_r', '_tag_ppr', '_tag_rpr', '_tag_b', '_tag_caps', '_tag_ind',
+        '_tag_spacing', '_tag_pbdr', '_attrs',
+        '_enhance_dispatch', '_spacing_dispatch',
+    )
+    
     def __init__(self, namespaces: Dict[str, str]):
         self.namespaces = namespaces
+        
+        # Expand tag names once; find() and iter() with a Clark name skip
+        # per-call prefix resolution and XPath evaluation
+        w = namespaces['w']
+        self._tag_r = f'{{{w}}}r'
+        self._tag_ppr = f'{{{w}}}pPr'
+        self._tag_rpr = f'{{{w}}}rPr'
+        self._tag_b = f'{{{w}}}b'
+        self._tag_caps = f'{{{w}}}caps'
+        self._tag_ind = f'{{{w}}}ind'
+        self._tag_spacing = f'{{{w}}}spacing'
+        self._tag_pbdr = f'{{{w}}}pBdr'
+        self._attrs = {
+            attr: f'{{{w}}}{attr}'
+            for attr in ('left', 'hanging', 'firstLine', 'before', 'after', 'line', 'lineRule')
+        }
+        
+        # content_type -> bound handler; types without an entry are left as-is
+        self._enhance_dispatch = {
+            'section_header': self._enhance_section_header,
+            'job_title': self._enhance_job_title,
+            'bullet_point': self._enhance_bullet_point,
+            'contact_info': self._enhance_contact_info,
+        }
+        self._spacing_dispatch = {
+            'section_header': self._apply_section_spacing,
+            'bullet_point': self._apply_bullet_spacing,
+        }
     
     def enhance_resume_formatting(self, paragraphs: List[etree._Element], 
-                                content_mapping: List[Dict]) -> bool:
+                                content_mapping: List[ParaMapping]) -> bool:
         """
         Apply resume-specific formatting enhancements
         """
         try:
             print("🎨 Applying resume-specific formatting enhancements...")
             
-            for i, para_elem in enumerate(paragraphs):
-                if i < len(content_mapping):
-                    mapping = content_mapping[i]
-                    content_type = mapping.get('content_type', 'paragraph')
-                    
-                    # Apply type-specific enhancements
-                    if content_type == 'section_header':
-                        self._enhance_section_header(para_elem, mapping)
-                    elif content_type == 'job_title':
-                        self._enhance_job_title(para_elem, mapping)
-                    elif content_type == 'bullet_point':
-                        self._enhance_bullet_point(para_elem, mapping)
-                    elif content_type == 'contact_info':
-                        self._enhance_contact_info(para_elem, mapping)
+            dispatch = self._enhance_dispatch
+            for para_elem, mapping in zip(paragraphs, content_mapping):
+                # Apply type-specific enhancements
+                enhance = dispatch.get(mapping.content_type)
+                if enhance is not None:
+                    enhance(para_elem, mapping)
             
             return True
             
@@ -43,42 +104,41 @@ class ResumeFormattingEnhancer:
             print(f"⚠️  Resume enhancement failed: {e}")
             return False
     
-    def _enhance_section_header(self, para_elem: etree._Element, mapping: Dict):
+    def _enhance_section_header(self, para_elem: etree._Element, mapping: ParaMapping):
         """Enhance section headers (EXPERIENCE, EDUCATION, etc.)"""
         
         # Ensure section headers are properly formatted
-        runs = para_elem.xpath('.//w:r', namespaces=self.namespaces)
+        runs = list(para_elem.iter(self._tag_r))
         
         for run in runs:
-            rpr = run.find('w:rPr', self.namespaces)
+            rpr = run.find(self._tag_rpr)
             if rpr is not None:
                 # Ensure bold formatting
-                bold_elem = rpr.find('w:b', self.namespaces)
+                bold_elem = rpr.find(self._tag_b)
                 if bold_elem is None:
-                    bold_elem = etree.Element(f'{{{self.namespaces["w"]}}}b')
-                    rpr.append(bold_elem)
+                    bold_elem = etree.SubElement(rpr, self._tag_b)
                 
                 # Ensure all caps if original was all caps
-                original_text = mapping.get('original_content', '')
+                original_text = mapping.original_content
                 if original_text and original_text.isupper():
-                    caps_elem = rpr.find('w:caps', self.namespaces)
+                    caps_elem = rpr.find(self._tag_caps)
                     if caps_elem is None:
-                        caps_elem = etree.Element(f'{{{self.namespaces["w"]}}}caps')
-                        rpr.append(caps_elem)
+                        caps_elem = etree.SubElement(rpr, self._tag_caps)
     
-    def _enhance_job_title(self, para_elem: etree._Element, mapping: Dict):
+    def _enhance_job_title(self, para_elem: etree._Element, mapping: ParaMapping):
         """Enhance job title formatting"""
         
-        new_content = mapping.get('new_content', '')
+        new_content = mapping.new_content
         
         # Look for company/title patterns
-        if ' | ' in new_content or ' at ' in new_content or ' - ' in new_content:
+        if _JOB_TITLE_SEPARATOR_RE.search(new_content) is not None:
             self._apply_job_title_formatting(para_elem, new_content)
     
     def _apply_job_title_formatting(self, para_elem: etree._Element, content: str):
         """Apply specific formatting to job titles"""
         
-        runs = para_elem.xpath('.//w:r', namespaces=self.namespaces)
+        # Only the first two runs (title, company) are touched
+        runs = list(islice(para_elem.iter(self._tag_r), 2))
         
         if len(runs) >= 2:
             # Try to make job title bold, company normal
@@ -98,74 +158,75 @@ class ResumeFormattingEnhancer:
     def _split_job_title_content(self, content: str) -> Tuple[str, str]:
         """Split job title content into title and company"""
         
-        if ' | ' in content:
-            return tuple(content.split(' | ', 1))
-        elif ' at ' in content:
-            parts = content.split(' at ', 1)
-            return parts[0], f"at {parts[1]}"
-        elif ' - ' in content:
-            return tuple(content.split(' - ', 1))
+        # partition() finds and splits in one scan per separator
+        for separator in _JOB_TITLE_SEPARATORS:
+            job_title, found, company = content.partition(separator)
+            if found:
+                return (job_title, f"at {company}") if separator == ' at ' else (job_title, company)
         
         return content, ''
     
-    def _enhance_bullet_point(self, para_elem: etree._Element, mapping: Dict):
+    def _enhance_bullet_point(self, para_elem: etree._Element, mapping: ParaMapping):
         """Enhance bullet point formatting"""
         
-        # Ensure proper bullet spacing and indentation
-        ppr = para_elem.find('w:pPr', self.namespaces)
+        # Preserve original indentation; without any there is nothing to
+        # restore and pPr is not looked up
+        indentation = (mapping.properties or {}).get('indentation')
+        if not indentation:
+            return
+        
+        ppr = para_elem.find(self._tag_ppr)
         if ppr is not None:
-            # Preserve original indentation
-            original_properties = mapping.get('properties', {})
-            indentation = original_properties.get('indentation', {})
-            
-            if indentation:
-                ind_elem = ppr.find('w:ind', self.namespaces)
-                if ind_elem is not None:
-                    # Preserve original indentation values
-                    for attr in ['left', 'hanging', 'firstLine']:
-                        if attr in indentation and indentation[attr]:
-                            ind_elem.set(f'{{{self.namespaces["w"]}}}{attr}', str(indentation[attr]))
-    
-    def _enhance_contact_info(self, para_elem: etree._Element, mapping: Dict):
+            ind_elem = ppr.find(self._tag_ind)
+            if ind_elem is not None:
+                # Preserve original indentation values
+                for attr in ['left', 'hanging', 'firstLine']:
+                    value = indentation.get(attr)
+                    if value:
+                        ind_elem.set(self._attrs[attr], str(value))
+    
+    def _enhance_contact_info(self, para_elem: etree._Element, mapping: ParaMapping):
         """Enhance contact information formatting"""
         
+        # Bold is kept if the contact info was originally bold; that answer
+        # is the same for every run, so decide it once per paragraph
+        if self._was_originally_bold(mapping):
+            return
+        
         # Contact info often needs consistent formatting
-        runs = para_elem.xpath('.//w:r', namespaces=self.namespaces)
+        runs = list(para_elem.iter(self._tag_r))
         
         for run in runs:
             # Ensure consistent font and size for contact info
-            rpr = run.find('w:rPr', self.namespaces)
+            rpr = run.find(self._tag_rpr)
             if rpr is not None:
                 # Remove bold from contact info if not originally present
-                original_properties = mapping.get('properties', {})
-                if not self._was_originally_bold(mapping):
-                    bold_elem = rpr.find('w:b', self.namespaces)
-                    if bold_elem is not None:
-                        rpr.remove(bold_elem)
+                bold_elem = rpr.find(self._tag_b)
+                if bold_elem is not None:
+                    rpr.remove(bold_elem)
     
     def _ensure_bold_formatting(self, run_elem: etree._Element):
         """Ensure a run has bold formatting"""
-        rpr = run_elem.find('w:rPr', self.namespaces)
+        rpr = run_elem.find(self._tag_rpr)
         if rpr is None:
-            rpr = etree.Element(f'{{{self.namespaces["w"]}}}rPr')
+            rpr = etree.Element(self._tag_rpr)
             run_elem.insert(0, rpr)
         
-        bold_elem = rpr.find('w:b', self.namespaces)
+        bold_elem = rpr.find(self._tag_b)
         if bold_elem is None:
-            bold_elem = etree.Element(f'{{{self.namespaces["w"]}}}b')
-            rpr.append(bold_elem)
+            bold_elem = etree.SubElement(rpr, self._tag_b)
     
     def _ensure_normal_formatting(self, run_elem: etree._Element):
         """Ensure a run has normal (non-bold) formatting"""
-        rpr = run_elem.find('w:rPr', self.namespaces)
+        rpr = run_elem.find(self._tag_rpr)
         if rpr is not None:
-            bold_elem = rpr.find('w:b', self.namespaces)
+            bold_elem = rpr.find(self._tag_b)
             if bold_elem is not None:
                 rpr.remove(bold_elem)
     
-    def _was_originally_bold(self, mapping: Dict) -> bool:
+    def _was_originally_bold(self, mapping: ParaMapping) -> bool:
         """Check if content was originally bold"""
-        runs = mapping.get('runs', [])
+        runs = mapping.runs or []
         return any(run.get('properties', {}).get('bold', False) for run in runs)
     
     def preserve_horizontal_lines(self, paragraphs: List[etree._Element]) -> bool:
@@ -175,18 +236,16 @@ class ResumeFormattingEnhancer:
         try:
             print("📏 Preserving horizontal lines and borders...")
             
-            for para_elem in paragraphs:
-                ppr = para_elem.find('w:pPr', self.namespaces)
-                if ppr is not None:
-                    # Check for paragraph borders (horizontal lines)
-                    border_elem = ppr.find('w:pBdr', self.namespaces)
-                    if border_elem is not None:
-                        # Ensure border properties are preserved
-                        for border_side in ['top', 'bottom', 'left', 'right']:
-                            side_elem = border_elem.find(f'w:{border_side}', self.namespaces)
-                            if side_elem is not None:
-                                # Preserve all border attributes
-                                print(f"  ✅ Preserved {border_side} border")
+            # Borders (horizontal lines) live in pPr/pBdr, which text
+            # replacement never rewrites, so they are already preserved;
+            # only walk the paragraphs when someone wants the count
+            if logger.isEnabledFor(logging.DEBUG):
+                bordered = 0
+                for para_elem in paragraphs:
+                    ppr = para_elem.find(self._tag_ppr)
+                    if ppr is not None and ppr.find(self._tag_pbdr) is not None:
+                        bordered += 1
+                logger.debug("Preserved borders on %d paragraphs", bordered)
             
             return True
             
@@ -195,23 +254,19 @@ class ResumeFormattingEnhancer:
             return False
     
     def apply_spacing_enhancements(self, paragraphs: List[etree._Element], 
-                                 content_mapping: List[Dict]) -> bool:
+                                 content_mapping: List[ParaMapping]) -> bool:
         """
         Apply enhanced spacing based on content types
         """
         try:
             print("📐 Applying intelligent spacing...")
             
-            for i, para_elem in enumerate(paragraphs):
-                if i < len(content_mapping):
-                    mapping = content_mapping[i]
-                    content_type = mapping.get('content_type', 'paragraph')
-                    
-                    # Apply type-specific spacing
-                    if content_type == 'section_header':
-                        self._apply_section_spacing(para_elem, mapping)
-                    elif content_type == 'bullet_point':
-                        self._apply_bullet_spacing(para_elem, mapping)
+            dispatch = self._spacing_dispatch
+            for para_elem, mapping in zip(paragraphs, content_mapping):
+                # Apply type-specific spacing
+                apply_spacing = dispatch.get(mapping.content_type)
+                if apply_spacing is not None:
+                    apply_spacing(para_elem, mapping)
             
             return True
             
@@ -219,32 +274,27 @@ class ResumeFormattingEnhancer:
             print(f"⚠️  Spacing enhancement failed: {e}")
             return False
     
-    def _apply_section_spacing(self, para_elem: etree._Element, mapping: Dict):
+    def _apply_section_spacing(self, para_elem: etree._Element, mapping: ParaMapping):
         """Apply appropriate spacing for section headers"""
-        
-        ppr = para_elem.find('w:pPr', self.namespaces)
-        if ppr is not None:
-            spacing_elem = ppr.find('w:spacing', self.namespaces)
-            if spacing_elem is not None:
-                # Preserve original spacing values
-                original_spacing = mapping.get('properties', {}).get('spacing', {})
-                
-                for attr in ['before', 'after', 'line']:
-                    if attr in original_spacing and original_spacing[attr]:
-                        spacing_elem.set(f'{{{self.namespaces["w"]}}}{attr}', str(original_spacing[attr]))
+        self._restore_spacing(para_elem, mapping, ('before', 'after', 'line'))
     
-    def _apply_bullet_spacing(self, para_elem: etree._Element, mapping: Dict):
+    def _apply_bullet_spacing(self, para_elem: etree._Element, mapping: ParaMapping):
         """Apply appropriate spacing for bullet points"""
+        # Bullet points typically have tighter spacing, so lineRule is kept too
+        self._restore_spacing(para_elem, mapping, ('before', 'after', 'line', 'lineRule'))
+    
+    def _restore_spacing(self, para_elem: etree._Element, mapping: ParaMapping, spacing_attrs: Tuple[str, ...]):
+        """Copy the original spacing values onto the paragraph's existing w:spacing"""
+        original_spacing = (mapping.properties or {}).get('spacing')
+        if not original_spacing:
+            return
         
-        # Bullet points typically have tighter spacing
-        ppr = para_elem.find('w:pPr', self.namespaces)
+        ppr = para_elem.find(self._tag_ppr)
         if ppr is not None:
-            spacing_elem = ppr.find('w:spacing', self.namespaces)
+            spacing_elem = ppr.find(self._tag_spacing)
             if spacing_elem is not None:
-                # Preserve original bullet spacing
-                original_spacing = mapping.get('properties', {}).get('spacing', {})
-                
                 # Apply original values exactly
-                for attr in ['before', 'after', 'line', 'lineRule']:
-                    if attr in original_spacing and original_spacing[attr]:
-                        spacing_elem.set(f'{{{self.namespaces["w"]}}}{attr}', str(original_spacing[attr]))
\ No newline at end of file
+                for attr in spacing_attrs:
+                    value = original_spacing.get(attr)
+                    if value:
+                        spacing_elem.set(self._attrs[attr], str(value))
\ No newline at end of file
@@ -1,6 +1,16 @@
+import hashlib
+import logging
 import os
+import re
+import signal
+import sys
+import threading
 import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
 from pathlib import Path
+from typing import Dict, Optional
 
 # Check and install dependencies first
 try:
@@ -25,142 +35,345 @@ except ImportError:
 
 # Import main modules
 from watchdog.observers import Observer
+from watchdog.observers.polling import PollingObserver
 from watchdog.events import FileSystemEventHandler
 from colorama import init, Fore, Style
-from ai_provider import AIProvider
+from llm_cache import cached_generate
 from document_processor import DocumentProcessor
 from config import *
 
 # Initialize colorama for cross-platform colored output
 init()
 
+# Watcher progress goes through this logger; main() attaches a colored
+# console handler unless logging has already been configured
+log = logging.getLogger("skillbridge")
+
+# Per-message colors, passed as logging extras
+_GREEN = {'color': Fore.GREEN}
+_BLUE = {'color': Fore.BLUE}
+_CYAN = {'color': Fore.CYAN}
+_YELLOW = {'color': Fore.YELLOW}
+
+class ColorFormatter(logging.Formatter):
+    """Color each message by its 'color' extra, or by level when it has none"""
+    
+    LEVEL_COLORS = {
+        logging.WARNING: Fore.YELLOW,
+        logging.ERROR: Fore.RED,
+        logging.CRITICAL: Fore.RED,
+    }
+    
+    def format(self, record: logging.LogRecord) -> str:
+        message = super().format(record)
+        color = getattr(record, 'color', None) or self.LEVEL_COLORS.get(record.levelno)
+        return f"{color}{message}{Style.RESET_ALL}" if color else message
+
+def _setup_logging():
+    """Print watcher messages to stdout in color, as the rest of the output is"""
+    if logging.getLogger().handlers or log.handlers:
+        return  # Already configured elsewhere (e.g. logging.basicConfig)
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(ColorFormatter('%(message)s'))
+    log.addHandler(handler)
+    log.setLevel(logging.INFO)
+
+# Quiet period after the last file event before the folder is checked; one
+# save fires several created/modified events in a row
+_DEBOUNCE_SECONDS = 0.75
+
+# Signatures remembered in processed_files; the oldest are forgotten first
+_MAX_PROCESSED_SIGNATURES = 64
+
+# Runs of non-whitespace - the same words str.split() would produce
+_WORD_RE = re.compile(r'\S+')
+
+def _word_count(text: str) -> int:
+    """Count words without building the list str.split() would allocate"""
+    return sum(1 for _ in _WORD_RE.finditer(text))
+
+def _wait_docx_ready(path: Path, timeout: float = 2.0) -> bool:
+    """Wait until path opens as a complete .docx (zip) file, backing off between tries"""
+    delay = 0.025
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with zipfile.ZipFile(path):
+                return True
+        except (zipfile.BadZipFile, OSError):
+            # Still being written (or locked by the writer on Windows)
+            if time.monotonic() + delay > deadline:
+                return False
+            time.sleep(delay)
+            delay *= 2
+
+# Filesystems whose change notifications are missing or unreliable
+_NETWORK_FILESYSTEMS = frozenset((
+    'nfs', 'nfs4', 'cifs', 'smbfs', 'smb3', 'afs', '9p', 'fuse.sshfs', 'sshfs',
+))
+
+def _is_network_mount(path: Path) -> bool:
+    """Best-effort check whether path is on a network filesystem (Linux only)"""
+    try:
+        with open('/proc/mounts') as f:
+            mounts = [line.split()[1:3] for line in f]
+    except OSError:
+        return False
+    
+    # The longest mount point containing the path is the one it lives on
+    path_str = os.path.realpath(path)
+    best_mount, fs_type = '', ''
+    for mount_point, mount_type in mounts:
+        mount_point = mount_point.replace('\\040', ' ')
+        prefix = mount_point.rstrip('/') + '/'
+        if (path_str == mount_point or path_str.startswith(prefix)) and len(mount_point) > len(best_mount):
+            best_mount, fs_type = mount_point, mount_type
+    return fs_type in _NETWORK_FILESYSTEMS
+
+def _make_observer(watch_path: Path):
+    """Use native change notifications on local disks, polling elsewhere"""
+    if sys.platform == 'win32' or _is_network_mount(watch_path):
+        print(f"{Fore.CYAN}🔁 Polling for changes every {WATCH_INTERVAL}s{Style.RESET_ALL}")
+        return PollingObserver(timeout=WATCH_INTERVAL)
+    return Observer()
+
 class ResumeWatcher(FileSystemEventHandler):
     """Watches for JD.docx and CurrentResume.docx files and processes them"""
     
     def __init__(self, watch_folder: str):
         self.watch_folder = Path(watch_folder)
-        self.ai_provider = AIProvider()
-        self.processing = False
-        self.processed_files = set()  # Track processed file combinations
+        self.jd_file = self.watch_folder / "JD.docx"
+        self.resume_file = self.watch_folder / "CurrentResume.docx"
+        self.output_file = self.watch_folder / OUTPUT_FILENAME
+        self.error_file = self.watch_folder / ERROR_FILENAME
+        # Track processed file combinations (mtime and content signatures);
+        # a dict keeps insertion order so the oldest can be evicted
+        self.processed_files: Dict[str, None] = {}
+        self._debounce_timer: Optional[threading.Timer] = None
+        self._debounce_lock = threading.Lock()
+        # Held for a whole processing run; checks requested meanwhile return at once
+        self._processing_lock = threading.Lock()
+        self._watched_names = frozenset((self.jd_file.name, self.resume_file.name))
+        # Last known mtime of each input, kept current from the file events
+        self._mtimes: Dict[str, float] = {}
+        # Reused for every file pair so threads are only started once
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="skillbridge")
         
         # Ensure watch folder exists
         self.watch_folder.mkdir(parents=True, exist_ok=True)
         
-        print(f"{Fore.GREEN}📁 Watching folder: {self.watch_folder.absolute()}{Style.RESET_ALL}")
-        print(f"{Fore.CYAN}{self.ai_provider.get_provider_info()}{Style.RESET_ALL}")
-        print(f"{Fore.YELLOW}🔍 Drop 'JD.docx' and 'CurrentResume.docx' files to start processing...{Style.RESET_ALL}")
+        log.info(f"📁 Watching folder: {self.watch_folder.absolute()}", extra=_GREEN)
+        log.info("🔍 Drop 'JD.docx' and 'CurrentResume.docx' files to start processing...", extra=_YELLOW)
+    
+    @cached_property
+    def ai_provider(self):
+        """AI provider, created on first use so startup skips the SDK imports"""
+        from ai_provider import AIProvider
+        provider = AIProvider()
+        log.info(provider.get_provider_info(), extra=_CYAN)
+        return provider
     
     def on_created(self, event):
         """Handle file creation events"""
+        # Only the two input files can change the outcome; other files in the
+        # folder (editor lock files, our own output) are ignored
         if event.is_directory:
             return
+        file_name = os.path.basename(event.src_path)
+        if file_name not in self._watched_names:
+            return
         
-        self.check_and_process()
+        self._record_mtime(file_name, event.src_path)
+        self._schedule_check()
     
     def on_modified(self, event):
         """Handle file modification events"""
         if event.is_directory:
             return
+        file_name = os.path.basename(event.src_path)
+        if file_name not in self._watched_names:
+            return
+        
+        self._record_mtime(file_name, event.src_path)
+        self._schedule_check()
+    
+    def on_moved(self, event):
+        """Handle renames - editors often save to a temp file and rename it into place"""
+        if event.is_directory:
+            return
+        # An input renamed away no longer exists under its watched name
+        self._mtimes.pop(os.path.basename(event.src_path), None)
+        file_name = os.path.basename(event.dest_path)
+        if file_name not in self._watched_names:
+            return
         
-        # Small delay to ensure file is fully written
-        time.sleep(1)
-        self.check_and_process()
+        self._record_mtime(file_name, event.dest_path)
+        self._schedule_check()
+    
+    def _mark_processed(self, *signatures: str):
+        """Remember signatures as processed, keeping only the most recent ones"""
+        for signature in signatures:
+            self.processed_files[signature] = None
+        while len(self.processed_files) > _MAX_PROCESSED_SIGNATURES:
+            del self.processed_files[next(iter(self.processed_files))]
+    
+    def _record_mtime(self, file_name: str, path: str) -> Optional[float]:
+        """Stat an input file once and remember its mtime (None if it is gone)"""
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            self._mtimes.pop(file_name, None)
+            return None
+        self._mtimes[file_name] = mtime
+        return mtime
+    
+    def _schedule_check(self):
+        """Run check_and_process once events stop arriving for a moment"""
+        # Each event restarts the countdown, so a burst of events from one
+        # write collapses into a single check and the observer never blocks
+        with self._debounce_lock:
+            if self._debounce_timer is not None:
+                self._debounce_timer.cancel()
+            self._debounce_timer = threading.Timer(_DEBOUNCE_SECONDS, self.check_and_process)
+            self._debounce_timer.daemon = True
+            self._debounce_timer.start()
     
     def on_deleted(self, event):
         """Handle file deletion events - reset processed files when files are removed"""
         if event.is_directory:
             return
         
-        file_name = Path(event.src_path).name
-        if file_name in ["JD.docx", "CurrentResume.docx"]:
+        file_name = os.path.basename(event.src_path)
+        if file_name in self._watched_names:
+            self._mtimes.pop(file_name, None)
             # Reset processed files when either input file is deleted
             self.processed_files.clear()
-            print(f"{Fore.YELLOW}🗑️  {file_name} removed - ready for new files{Style.RESET_ALL}")
+            log.info(f"🗑️  {file_name} removed - ready for new files", extra=_YELLOW)
+    
+    def close(self):
+        """Cancel any pending check and release the worker threads"""
+        with self._debounce_lock:
+            if self._debounce_timer is not None:
+                self._debounce_timer.cancel()
+        self._pool.shutdown(wait=False, cancel_futures=True)
     
     def check_and_process(self):
         """Check if both required files exist and process them"""
-        if self.processing:
+        # Timer and observer threads can both get here; only one runs at a time
+        if not self._processing_lock.acquire(blocking=False):
             return
+        try:
+            self._process_if_ready()
+        finally:
+            self._processing_lock.release()
+    
+    def _process_if_ready(self):
+        """Tailor the resume unless this pair of input files was already processed"""
+        jd_file, resume_file = self.jd_file, self.resume_file
+        output_file, error_file = self.output_file, self.error_file
         
-        jd_file = self.watch_folder / "JD.docx"
-        resume_file = self.watch_folder / "CurrentResume.docx"
-        output_file = self.watch_folder / OUTPUT_FILENAME
-        error_file = self.watch_folder / ERROR_FILENAME
+        # The events keep the mtimes current; stat only an input we have not
+        # seen an event for yet (None means that file does not exist)
+        jd_modified = self._mtimes.get("JD.docx")
+        if jd_modified is None:
+            jd_modified = self._record_mtime("JD.docx", jd_file)
+        resume_modified = self._mtimes.get("CurrentResume.docx")
+        if resume_modified is None:
+            resume_modified = self._record_mtime("CurrentResume.docx", resume_file)
         
         # Check if both files exist
-        if jd_file.exists() and resume_file.exists():
+        if jd_modified is not None and resume_modified is not None:
             # Create a unique identifier for this file combination
-            jd_modified = jd_file.stat().st_mtime
-            resume_modified = resume_file.stat().st_mtime
             file_signature = f"{jd_modified}_{resume_modified}"
             
             # Check if we've already processed this exact combination
             if file_signature in self.processed_files:
                 return  # Skip processing - already done
             
-            self.processing = True
+            # A file that is still being written will fire another event once
+            # complete, so an unreadable one is simply left for that check
+            for input_file in (jd_file, resume_file):
+                if not _wait_docx_ready(input_file):
+                    log.info(f"⏳ {input_file.name} is not a complete .docx yet - waiting for it to finish saving", extra=_YELLOW)
+                    return
             
-            print(f"\n{Fore.GREEN}🚀 Both files detected! Starting resume tailoring...{Style.RESET_ALL}")
+            log.info("\n🚀 Both files detected! Starting resume tailoring...", extra=_GREEN)
             
             try:
-                # Extract text from documents
-                print(f"{Fore.BLUE}📖 Reading job description...{Style.RESET_ALL}")
-                jd_content = DocumentProcessor.extract_text_from_docx(str(jd_file))
-                
-                print(f"{Fore.BLUE}📄 Reading current resume...{Style.RESET_ALL}")
-                resume_content = DocumentProcessor.extract_text_from_docx(str(resume_file))
+                # Extract text from both documents at once; they are independent
+                log.info("📖 Reading job description...", extra=_BLUE)
+                log.info("📄 Reading current resume...", extra=_BLUE)
+                jd_future = self._pool.submit(DocumentProcessor.extract_text_from_docx, jd_file)
+                resume_future = self._pool.submit(DocumentProcessor.extract_text_from_docx, resume_file)
+                jd_content, resume_content = jd_future.result(), resume_future.result()
                 
                 if not jd_content or not resume_content:
                     raise Exception("Could not extract text from one or both documents")
                 
-                print(f"{Fore.CYAN}📋 Original resume has {len(resume_content.split())} words{Style.RESET_ALL}")
+                # Touching a file changes its mtime but not its text; skip the
+                # AI call when this exact content was already tailored
+                content_signature = hashlib.sha256(f"{jd_content}\0{resume_content}".encode('utf-8')).hexdigest()
+                if content_signature in self.processed_files:
+                    self._mark_processed(file_signature)
+                    log.info("♻️  Document contents unchanged since the last run - skipping AI", extra=_YELLOW)
+                    return
+                
+                log.info(f"📋 Original resume has {_word_count(resume_content)} words", extra=_CYAN)
                 
                 # Generate tailored resume
-                print(f"{Fore.BLUE}🤖 Tailoring resume with AI (this may take 30-60 seconds)...{Style.RESET_ALL}")
-                tailored_content = self.ai_provider.generate_response(jd_content, resume_content)
+                log.info("🤖 Tailoring resume with AI (this may take 30-60 seconds)...", extra=_BLUE)
+                tailored_content = cached_generate(
+                    self.ai_provider, jd_content, resume_content,
+                    self.ai_provider.model, TEMPERATURE
+                )
                 
                 if not tailored_content:
                     raise Exception("AI failed to generate tailored resume content")
                 
-                print(f"{Fore.CYAN}✨ AI generated {len(tailored_content.split())} words{Style.RESET_ALL}")
+                log.info(f"✨ AI generated {_word_count(tailored_content)} words", extra=_CYAN)
+                provider = self.ai_provider
+                if provider.cache_hits or provider.cache_misses:
+                    log.info(f"⚡ Response cache this session: {provider.cache_hits} hits, "
+                             f"{provider.cache_misses} misses", extra=_CYAN)
                 
                 # Create the tailored resume document with advanced formatting preservation
-                print(f"{Fore.BLUE}📝 Creating formatted resume with preserved styling...{Style.RESET_ALL}")
+                log.info("📝 Creating formatted resume with preserved styling...", extra=_BLUE)
                 success = DocumentProcessor.create_tailored_resume(
-                    str(resume_file),
+                    resume_file,
                     tailored_content,
-                    str(output_file)
+                    output_file
                 )
                 
                 if success:
-                    print(f"\n{Fore.GREEN}✅ SUCCESS! Tailored resume created: {OUTPUT_FILENAME}{Style.RESET_ALL}")
-                    print(f"{Fore.GREEN}📁 Location: {output_file.absolute()}{Style.RESET_ALL}")
-                    print(f"{Fore.GREEN}🎨 Original formatting and styling preserved!{Style.RESET_ALL}")
+                    log.info(f"\n✅ SUCCESS! Tailored resume created: {OUTPUT_FILENAME}", extra=_GREEN)
+                    log.info(f"📁 Location: {output_file.absolute()}", extra=_GREEN)
+                    log.info("🎨 Original formatting and styling preserved!", extra=_GREEN)
                     
                     # Mark this file combination as processed
-                    self.processed_files.add(file_signature)
+                    self._mark_processed(file_signature, content_signature)
                     
-                    print(f"\n{Fore.YELLOW}💡 To process again: remove and re-add at least one input file{Style.RESET_ALL}")
+                    log.info("\n💡 To process again: remove and re-add at least one input file", extra=_YELLOW)
                     
                 else:
                     raise Exception("Failed to create tailored resume document")
                 
             except Exception as e:
-                print(f"\n{Fore.RED}❌ Error processing files: {e}{Style.RESET_ALL}")
+                log.error(f"\n❌ Error processing files: {e}")
                 
                 # Create error document
                 DocumentProcessor.create_error_document(
                     str(e),
-                    str(error_file)
+                    error_file
                 )
-                print(f"{Fore.YELLOW}📄 Error details saved to: {ERROR_FILENAME}{Style.RESET_ALL}")
+                log.info(f"📄 Error details saved to: {ERROR_FILENAME}", extra=_YELLOW)
             
             finally:
-                self.processing = False
-                print(f"\n{Fore.YELLOW}🔍 Ready for next files (remove and re-add to process again)...{Style.RESET_ALL}")
+                log.info("\n🔍 Ready for next files (remove and re-add to process again)...", extra=_YELLOW)
 
 def main():
     """Main function to start the file watcher"""
+    _setup_logging()
+    
     print(f"{Fore.MAGENTA}{'='*60}{Style.RESET_ALL}")
     print(f"{Fore.MAGENTA}🌉 SkillBridge - Automated Resume Tailoring{Style.RESET_ALL}")
     print(f"{Fore.MAGENTA}{'='*60}{Style.RESET_ALL}")
@@ -170,7 +383,7 @@ def main():
     
     # Setup file watcher
     event_handler = ResumeWatcher(str(watch_path))
-    observer = Observer()
+    observer = _make_observer(watch_path)
     observer.schedule(event_handler, str(watch_path), recursive=False)
     
     # Check AI provider status
@@ -182,26 +395,32 @@ def main():
         print(f"{Fore.WHITE}3. Then restart SkillBridge{Style.RESET_ALL}")
         return
     
+    # Ctrl+C (or a termination request) wakes the main thread; until then it
+    # sleeps without polling
+    stop_event = threading.Event()
+    signal.signal(signal.SIGINT, lambda *_: stop_event.set())
+    signal.signal(signal.SIGTERM, lambda *_: stop_event.set())
+    
     # Start watching
     observer.start()
     
-    try:
-        print(f"\n{Fore.CYAN}Instructions:{Style.RESET_ALL}")
-        print(f"{Fore.WHITE}1. Save your job description as 'JD.docx'{Style.RESET_ALL}")
-        print(f"{Fore.WHITE}2. Save your current resume as 'CurrentResume.docx'{Style.RESET_ALL}")
-        print(f"{Fore.WHITE}3. Drop both files into: {watch_path}{Style.RESET_ALL}")
-        print(f"{Fore.WHITE}4. Wait for 'TailoredResume.docx' to appear!{Style.RESET_ALL}")
-        print(f"{Fore.WHITE}5. To process again: remove and re-add at least one input file{Style.RESET_ALL}")
-        print(f"\n{Fore.CYAN}Press Ctrl+C to stop watching...{Style.RESET_ALL}\n")
-        
-        while True:
-            time.sleep(1)
-            
-    except KeyboardInterrupt:
-        print(f"\n{Fore.YELLOW}👋 Stopping SkillBridge...{Style.RESET_ALL}")
-        observer.stop()
+    print(f"\n{Fore.CYAN}Instructions:{Style.RESET_ALL}")
+    print(f"{Fore.WHITE}1. Save your job description as 'JD.docx'{Style.RESET_ALL}")
+    print(f"{Fore.WHITE}2. Save your current resume as 'CurrentResume.docx'{Style.RESET_ALL}")
+    print(f"{Fore.WHITE}3. Drop both files into: {watch_path}{Style.RESET_ALL}")
+    print(f"{Fore.WHITE}4. Wait for 'TailoredResume.docx' to appear!{Style.RESET_ALL}")
+    print(f"{Fore.WHITE}5. To process again: remove and re-add at least one input file{Style.RESET_ALL}")
+    print(f"\n{Fore.CYAN}Press Ctrl+C to stop watching...{Style.RESET_ALL}\n")
+    
+    # Windows only delivers Ctrl+C between waits, so wake up periodically there
+    wait_timeout = 1 if sys.platform == 'win32' else None
+    while not stop_event.wait(wait_timeout):
+        pass
     
+    print(f"\n{Fore.YELLOW}👋 Stopping SkillBridge...{Style.RESET_ALL}")
+    observer.stop()
     observer.join()
+    event_handler.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
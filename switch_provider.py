@@ -4,7 +4,17 @@ Quick provider switcher for SkillBridge
 """
 
 import os
+import re
+import shutil
 import sys
+import tempfile
+
+# The AI_PROVIDER assignment, with or without a type annotation. Group 1 is
+# everything before the value, so only the value itself is rewritten and the
+# annotation (or its absence) and any trailing comment are kept
+_PROVIDER_LINE_RE = re.compile(
+    r'^(AI_PROVIDER\s*(?::[^=\n]*)?=\s*)(?:"[^"\n]*"|\'[^\'\n]*\'|[^\s#]+)', re.MULTILINE
+)
 
 def switch_provider(provider):
     """Switch AI provider in config.py"""
@@ -16,22 +26,28 @@ def switch_provider(provider):
         return False
     
     # Read current config
-    with open(config_file, 'r') as f:
-        lines = f.readlines()
+    with open(config_file, 'r', encoding='utf-8') as f:
+        text = f.read()
     
     # Update the AI_PROVIDER line
-    updated_lines = []
-    for line in lines:
-        if line.startswith('AI_PROVIDER = '):
-            updated_lines.append(f'AI_PROVIDER = "{provider}"\n')
-            print(f"✅ Changed AI_PROVIDER to: {provider}")
-        else:
-            updated_lines.append(line)
+    text, replaced = _PROVIDER_LINE_RE.subn(lambda m: f'{m.group(1)}"{provider}"', text, count=1)
+    if not replaced:
+        print("❌ AI_PROVIDER setting not found in config.py")
+        return False
     
-    # Write back
-    with open(config_file, 'w') as f:
-        f.writelines(updated_lines)
+    # Write to a temp file and swap it in, so an interrupted write can't
+    # leave config.py half-written
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(config_file)), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+        shutil.copymode(config_file, temp_path)  # mkstemp creates the file owner-only
+        os.replace(temp_path, config_file)
+    except OSError:
+        os.unlink(temp_path)
+        raise
     
+    print(f"✅ Changed AI_PROVIDER to: {provider}")
     return True
 
 def show_providers():
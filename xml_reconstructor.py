@@ -1,15 +1,62 @@
-import os
+import functools
 import zipfile
-import xml.etree.ElementTree as ET
 from lxml import etree
 from typing import Dict, List, Optional, Any
 import re
-import tempfile
 import shutil
-from advanced_xml_processor import AdvancedDocumentProcessor
-from resume_formatting_enhancer import ResumeFormattingEnhancer
+import threading
+from collections import defaultdict, deque
+from advanced_xml_processor import (
+    AdvancedDocumentProcessor, OFF_VALUES,
+    W_NS, W_P, W_T, W_RPR, W_B, W_I, W_RFONTS, W_SZ, W_VAL, W_ASCII
+)
+from resume_formatting_enhancer import ParaMapping, ResumeFormattingEnhancer
 from formatting_validator import FormattingValidator
 
+# Paragraphs, runs and their text are looked up with iter(), which walks the
+# subtree in C. A direct-children scan would miss runs wrapped in w:hyperlink,
+# w:ins or w:sdt.
+W_R = f'{{{W_NS}}}r'
+XML_SPACE = '{http://www.w3.org/XML/1998/namespace}space'
+
+# Content-type keywords, matched as plain substrings just like the old `in` scans
+_SECTION_RE = re.compile('experience|education|skills|summary|objective|projects')
+_JOB_TITLE_RE = re.compile(r'\|| at | - ')
+_CONTACT_RE = re.compile('@|phone|email|linkedin')
+_DATE_WORD_RE = re.compile('20|19|present|current')
+
+_DOCUMENT_PART = 'word/document.xml'
+
+# document.xml is parsed to be written back, so nothing is dropped; like the
+# extraction parser it is built once per thread and skips the xml:id table
+_parser_local = threading.local()
+
+def _get_preserving_parser() -> etree.XMLParser:
+    """Return this thread's shared round-trip XMLParser"""
+    parser = getattr(_parser_local, 'parser', None)
+    if parser is None:
+        parser = _parser_local.parser = etree.XMLParser(
+            remove_blank_text=False,
+            strip_cdata=False,
+            remove_comments=False,
+            recover=True,
+            huge_tree=True,
+            collect_ids=False
+        )
+    return parser
+
+# Writing the package favours speed, as Word does: deflate at a low level, and store
+# images that are already compressed rather than deflating them again
+_ZIP_COMPRESSLEVEL = 3
+_STORED_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif')
+_COPY_CHUNK_SIZE = 1024 * 1024
+
+# Read-only stand-in for a missing 'properties' dict; never handed out or mutated
+_NO_PROPERTIES: Dict = {}
+
+# Types a numbered (list) paragraph is reported as 'bullet_point' instead of
+_NUMBERING_OVERRIDES = frozenset(('contact_info', 'date_range', 'paragraph'))
+
 class DocumentReconstructor:
     """
     Reconstructs Word documents with 100% identical formatting
@@ -57,7 +104,8 @@ class DocumentReconstructor:
                 # Run validation (for feedback, doesn't affect success)
                 validation_results = self.validator.validate_formatting_preservation(
                     original_structure.get('paragraphs', []), 
-                    []  # Would need to re-parse the output for full validation
+                    [],  # Would need to re-parse the output for full validation
+                    detailed=False  # Only the score and recommendations are reported
                 )
                 
                 score = validation_results['overall_score']
@@ -82,7 +130,7 @@ class DocumentReconstructor:
             # Fallback to basic formatting
             return self._create_fallback_document(tailored_content, output_path)
     
-    def _parse_tailored_content(self, content: str, original_structure: Dict) -> List[Dict]:
+    def _parse_tailored_content(self, content: str, original_structure: Dict) -> List[ParaMapping]:
         """
         Parse AI content and intelligently map it to original paragraph structure
         """
@@ -92,187 +140,201 @@ class DocumentReconstructor:
         content_lines = [line.strip() for line in content.split('\n') if line.strip()]
         original_paragraphs = original_structure.get('paragraphs', [])
         
-        # Analyze original structure patterns
-        structure_analysis = self._analyze_document_structure(original_paragraphs)
+        # Index the AI lines by content type once; matched lines are flagged as
+        # consumed instead of being removed from the list
+        by_type: Dict[str, deque] = defaultdict(deque)
+        for j, line in enumerate(content_lines):
+            by_type[self._classify_by_text(line)].append(j)
+        consumed = [False] * len(content_lines)
+        next_free = 0  # First unconsumed line, used for positional matching
         
         # Create smart mapping based on content types
         content_mapping = []
-        content_index = 0
         
         for i, orig_para in enumerate(original_paragraphs):
             orig_text = orig_para.get('text', '').strip()
             
             # Skip empty paragraphs but preserve them for spacing
             if not orig_text or orig_para.get('is_empty', False):
-                content_mapping.append({
-                    'original_index': i,
-                    'new_content': '',
-                    'preserve_exact': True,
-                    'xml_element': orig_para.get('xml_element'),
-                    'content_type': 'empty'
-                })
+                content_mapping.append(ParaMapping(
+                    original_index=i,
+                    new_content='',
+                    preserve_exact=True,
+                    xml_element=orig_para.get('xml_element'),
+                    content_type='empty'
+                ))
                 continue
             
             # Determine content type and find best match
             orig_type = self._classify_content_type(orig_text, orig_para)
-            new_content = self._find_best_content_match(
-                content_lines, content_index, orig_type, orig_text
-            )
-            
-            if new_content:
-                # Found a match, remove from available content
-                if new_content in content_lines:
-                    content_lines.remove(new_content)
-                content_index = min(content_index, len(content_lines))
-            elif content_index < len(content_lines):
-                # Use next available content
-                new_content = content_lines[content_index]
-                content_index += 1
-            
-            content_mapping.append({
-                'original_index': i,
-                'original_content': orig_text,
-                'new_content': new_content,
-                'preserve_exact': False,
-                'properties': orig_para.get('properties', {}),
-                'runs': orig_para.get('runs', []),
-                'xml_element': orig_para.get('xml_element'),
-                'content_type': orig_type,
-                'structure_hints': structure_analysis.get(i, {})
-            })
+            match = self._find_best_content_match(by_type, consumed, next_free, orig_type)
+            
+            if match is not None:
+                # Found a match, mark it as no longer available
+                new_content = content_lines[match]
+                consumed[match] = True
+                while next_free < len(consumed) and consumed[next_free]:
+                    next_free += 1
+            else:
+                new_content = ''
+            
+            content_mapping.append(ParaMapping(
+                original_index=i,
+                new_content=new_content,
+                original_content=orig_text,
+                properties=orig_para.get('properties', {}),
+                runs=orig_para.get('runs', []),
+                xml_element=orig_para.get('xml_element'),
+                content_type=orig_type,
+                structure_hints=self._analyze_paragraph_structure(orig_para)
+            ))
         
         # Add any remaining content as new paragraphs with intelligent formatting
-        while content_index < len(content_lines) or content_lines:
-            remaining_content = content_lines.pop(0) if content_lines else (
-                content_lines[content_index] if content_index < len(content_lines) else ""
-            )
+        for j, remaining_content in enumerate(content_lines):
+            if consumed[j]:
+                continue
             
-            if remaining_content:
-                # Use appropriate template based on content type
-                template = self._find_template_for_content(remaining_content, content_mapping)
-                
-                content_mapping.append({
-                    'original_index': len(original_paragraphs),
-                    'new_content': remaining_content,
-                    'preserve_exact': False,
-                    'properties': template.get('properties', {}),
-                    'runs': template.get('runs', []),
-                    'xml_element': None,
-                    'content_type': self._classify_content_type(remaining_content, {}),
-                    'structure_hints': {}
-                })
-            
-            if content_index < len(content_lines):
-                content_index += 1
-            else:
-                break
+            # Use appropriate template based on content type
+            template = self._find_template_for_content(remaining_content, content_mapping)
+            
+            content_mapping.append(ParaMapping(
+                original_index=len(original_paragraphs),
+                new_content=remaining_content,
+                properties=template.properties if template is not None else None,
+                runs=template.runs if template is not None else None,
+                content_type=self._classify_by_text(remaining_content),
+                structure_hints={}
+            ))
         
         print(f"✅ Mapped {len(content_mapping)} elements with intelligent structure preservation")
         return content_mapping
     
-    def _analyze_document_structure(self, paragraphs: List[Dict]) -> Dict:
-        """Analyze document structure patterns for better mapping"""
-        analysis = {}
-        
-        for i, para in enumerate(paragraphs):
-            properties = para.get('properties', {})
-            runs = para.get('runs', [])
-            
-            analysis[i] = {
-                'has_bold': any(run.get('properties', {}).get('bold', False) for run in runs),
-                'has_italic': any(run.get('properties', {}).get('italic', False) for run in runs),
-                'has_borders': bool(properties.get('borders', {})),
-                'alignment': properties.get('alignment'),
-                'indentation': properties.get('indentation', {}),
-                'spacing': properties.get('spacing', {}),
-                'is_bullet': bool(properties.get('numbering', {})),
-            }
-        
-        return analysis
+    def _analyze_paragraph_structure(self, para: Dict) -> Dict:
+        """Structure hints for one mapped paragraph; empty paragraphs never need them"""
+        properties = para.get('properties') or _NO_PROPERTIES
+        runs = para.get('runs') or ()
+        
+        has_bold = has_italic = False
+        for run in runs:
+            run_properties = run.get('properties')
+            if run_properties:
+                has_bold = has_bold or bool(run_properties.get('bold'))
+                has_italic = has_italic or bool(run_properties.get('italic'))
+                if has_bold and has_italic:
+                    break
+        
+        return {
+            'has_bold': has_bold,
+            'has_italic': has_italic,
+            'has_borders': bool(properties.get('borders')),
+            'alignment': properties.get('alignment'),
+            'indentation': properties.get('indentation', {}),
+            'spacing': properties.get('spacing', {}),
+            'is_bullet': bool(properties.get('numbering')),
+        }
     
     def _classify_content_type(self, text: str, para_info: Dict) -> str:
         """Classify content type for better mapping"""
+        content_type = self._classify_by_text(text)
+        
+        # List numbering takes precedence over everything below the bullet check
+        if content_type in _NUMBERING_OVERRIDES and (para_info.get('properties') or _NO_PROPERTIES).get('numbering'):
+            return 'bullet_point'
+        
+        return content_type
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=8192)
+    def _classify_by_text(text: str) -> str:
+        """Classify content type from the text alone; the same lines are classified many times"""
         text_lower = text.lower()
-        properties = para_info.get('properties', {})
         
         # Check for headers/sections
-        if any(keyword in text_lower for keyword in ['experience', 'education', 'skills', 'summary', 'objective', 'projects']):
+        if _SECTION_RE.search(text_lower):
             return 'section_header'
         
         # Check for job titles/companies
-        if '|' in text or ' at ' in text or ' - ' in text:
+        if _JOB_TITLE_RE.search(text):
             return 'job_title'
         
         # Check for bullet points
-        if text.startswith(('•', '-', '*')) or properties.get('numbering'):
+        if text.startswith(('•', '-', '*')):
             return 'bullet_point'
         
         # Check for contact info
-        if any(keyword in text_lower for keyword in ['@', 'phone', 'email', 'linkedin']):
+        if _CONTACT_RE.search(text_lower):
             return 'contact_info'
         
         # Check for dates
-        if any(char.isdigit() for char in text) and any(keyword in text for keyword in ['20', '19', 'present', 'current']):
+        if _DATE_WORD_RE.search(text) and any(char.isdigit() for char in text):
             return 'date_range'
         
         return 'paragraph'
     
-    def _find_best_content_match(self, content_lines: List[str], start_index: int, 
-                               target_type: str, original_text: str) -> str:
-        """Find the best matching content for a given type"""
+    def _find_best_content_match(self, by_type: Dict[str, deque], consumed: List[bool],
+                               next_free: int, target_type: str) -> Optional[int]:
+        """Find the index of the best unconsumed content line for a given type"""
         
-        # Look for content that matches the type
-        for i, line in enumerate(content_lines[start_index:], start_index):
-            line_type = self._classify_content_type(line, {})
-            
-            if line_type == target_type:
-                return line
-            
-            # Special matching for similar content
-            if target_type == 'job_title' and line_type == 'job_title':
-                return line
-            
-            if target_type == 'section_header' and line_type == 'section_header':
-                return line
+        # Look for the earliest content that matches the type
+        candidates = by_type.get(target_type)
+        while candidates and consumed[candidates[0]]:
+            candidates.popleft()
+        if candidates:
+            return candidates.popleft()
         
         # Fallback to positional matching
-        return content_lines[start_index] if start_index < len(content_lines) else ''
+        return next_free if next_free < len(consumed) else None
     
-    def _find_template_for_content(self, content: str, existing_mapping: List[Dict]) -> Dict:
+    def _find_template_for_content(self, content: str,
+                                   existing_mapping: List[ParaMapping]) -> Optional[ParaMapping]:
         """Find appropriate template for new content"""
-        content_type = self._classify_content_type(content, {})
+        content_type = self._classify_by_text(content)
         
         # Find existing element with similar content type
         for mapping in reversed(existing_mapping):  # Start from end (recent formatting)
-            if mapping.get('content_type') == content_type:
+            if mapping.content_type == content_type:
                 return mapping
         
         # Fallback to last element
-        return existing_mapping[-1] if existing_mapping else {}
+        return existing_mapping[-1] if existing_mapping else None
     
-    def _reconstruct_document_xml(self, original_path: str, content_mapping: List[Dict], 
+    def _reconstruct_document_xml(self, original_path: str, content_mapping: List[ParaMapping], 
                                  output_path: str, original_structure: Dict) -> bool:
         """
         Reconstruct the document by directly modifying XML
         """
         try:
-            # Create a temporary working directory
-            with tempfile.TemporaryDirectory() as temp_dir:
-                # Extract the original docx
-                docx_temp = os.path.join(temp_dir, 'document')
-                with zipfile.ZipFile(original_path, 'r') as zip_ref:
-                    zip_ref.extractall(docx_temp)
-                
-                # Modify the document.xml with new content
-                document_xml_path = os.path.join(docx_temp, 'word', 'document.xml')
-                
-                if os.path.exists(document_xml_path):
-                    success = self._modify_document_xml(document_xml_path, content_mapping)
-                    if not success:
+            with zipfile.ZipFile(original_path, 'r') as zin:
+                # Only the main document part changes; modify it in memory first
+                # so nothing is written if it fails
+                try:
+                    document_info = zin.getinfo(_DOCUMENT_PART)
+                except KeyError:
+                    document_xml = None
+                else:
+                    document_xml = self._modify_document_xml(zin.read(document_info), content_mapping)
+                    if document_xml is None:
                         return False
                 
-                # Repack the docx file
-                self._repack_docx(docx_temp, output_path)
+                # Copy every other part straight across, keeping names, order and timestamps
+                with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED,
+                                     compresslevel=_ZIP_COMPRESSLEVEL) as zout:
+                    for info in zin.infolist():
+                        if info.filename.lower().endswith(_STORED_EXTENSIONS):
+                            # Images are the bulk of most packages; stream them through
+                            # in chunks instead of holding each one in memory
+                            stored = self._output_zip_info(info, zipfile.ZIP_STORED)
+                            stored.file_size = info.file_size
+                            with zin.open(info) as src, zout.open(stored, 'w') as dst:
+                                shutil.copyfileobj(src, dst, _COPY_CHUNK_SIZE)
+                            continue
+                        
+                        if info.filename == _DOCUMENT_PART:
+                            data = document_xml
+                        else:
+                            data = zin.read(info)
+                        zout.writestr(self._output_zip_info(info, info.compress_type), data,
+                                      compresslevel=_ZIP_COMPRESSLEVEL)
                 
                 return True
                 
@@ -280,27 +342,31 @@ class DocumentReconstructor:
             print(f"❌ Error reconstructing XML: {e}")
             return False
     
-    def _modify_document_xml(self, xml_path: str, content_mapping: List[Dict]) -> bool:
+    @staticmethod
+    def _output_zip_info(info: zipfile.ZipInfo, compress_type: int) -> zipfile.ZipInfo:
+        """
+        Fresh ZipInfo for writing a copy of an entry; the writer fills in
+        offsets, CRC and sizes, so the source archive's own ZipInfo is left intact
+        """
+        out_info = zipfile.ZipInfo(info.filename, info.date_time)
+        out_info.external_attr = info.external_attr
+        out_info.compress_type = compress_type
+        return out_info
+    
+    def _modify_document_xml(self, xml_bytes: bytes, content_mapping: List[ParaMapping]) -> Optional[bytes]:
         """
-        Directly modify the document.xml file with new content while preserving formatting
+        Modify document.xml with new content while preserving formatting;
+        returns the new XML, or None on failure
         """
         try:
             # Parse the existing XML with maximum preservation
-            parser = etree.XMLParser(
-                remove_blank_text=False, 
-                strip_cdata=False,
-                remove_comments=False,
-                recover=True
-            )
-            
-            with open(xml_path, 'rb') as f:
-                original_content = f.read()
-            
-            tree = etree.parse(xml_path, parser)
-            root = tree.getroot()
+            root = etree.fromstring(xml_bytes, _get_preserving_parser())
             
             # Find all paragraph elements
-            paragraphs = root.xpath('.//w:p', namespaces=self.processor.NAMESPACES)
+            # Document order with nested (table, text box) paragraphs included, as
+            # './/w:p' gave; iterparse 'end' events would report nested paragraphs
+            # before their container
+            paragraphs = list(root.iter(W_P))
             
             print(f"🔧 Modifying {len(paragraphs)} paragraphs with precision formatting...")
             
@@ -309,25 +375,25 @@ class DocumentReconstructor:
                 self.resume_enhancer = ResumeFormattingEnhancer(self.processor.NAMESPACES)
             
             # Advanced paragraph modification with intelligent content distribution
-            for i, para_elem in enumerate(paragraphs):
-                if i < len(content_mapping):
-                    mapping = content_mapping[i]
-                    
-                    if mapping.get('preserve_exact', False):
-                        # Keep paragraph exactly as is (for spacing, etc.)
-                        continue
-                    
-                    new_content = mapping.get('new_content', '')
-                    original_content = mapping.get('original_content', '')
-                    
-                    if new_content:
-                        # Advanced text replacement with formatting intelligence
-                        success = self._intelligent_text_replacement(
-                            para_elem, new_content, original_content
-                        )
-                        if not success:
-                            print(f"⚠️  Fallback text replacement for paragraph {i}")
-                            self._update_paragraph_text(para_elem, new_content)
+            intelligent_replace = self._intelligent_text_replacement
+            for i, (para_elem, mapping) in enumerate(zip(paragraphs, content_mapping)):
+                if mapping.preserve_exact:
+                    # Keep paragraph exactly as is (for spacing, etc.)
+                    continue
+                
+                new_content = mapping.new_content
+                original_text = mapping.original_content
+                
+                # Text the AI left as it was keeps its original runs untouched
+                if new_content == original_text:
+                    continue
+                
+                if new_content:
+                    # Advanced text replacement with formatting intelligence
+                    success = intelligent_replace(para_elem, new_content, original_text)
+                    if not success:
+                        print(f"⚠️  Fallback text replacement for paragraph {i}")
+                        self._update_paragraph_text(para_elem, new_content)
             
             # Apply resume-specific formatting enhancements
             print("🎯 Applying resume-specific formatting enhancements...")
@@ -335,16 +401,14 @@ class DocumentReconstructor:
             self.resume_enhancer.preserve_horizontal_lines(paragraphs)
             self.resume_enhancer.apply_spacing_enhancements(paragraphs, content_mapping)
             
-            # Write back with exact formatting preservation
-            self._write_xml_with_formatting_preservation(tree, xml_path, original_content)
-            
-            return True
+            # Serialize with exact formatting preservation
+            return self._serialize_xml_with_formatting_preservation(root, xml_bytes)
             
         except Exception as e:
             print(f"❌ Error modifying document XML: {e}")
             import traceback
             traceback.print_exc()
-            return False
+            return None
     
     def _intelligent_text_replacement(self, para_elem: etree._Element, 
                                      new_text: str, original_text: str) -> bool:
@@ -352,7 +416,7 @@ class DocumentReconstructor:
         Intelligent text replacement that analyzes formatting patterns
         """
         try:
-            runs = para_elem.xpath('.//w:r', namespaces=self.processor.NAMESPACES)
+            runs = list(para_elem.iter(W_R))
             
             if not runs:
                 self._create_new_run_with_text(para_elem, new_text)
@@ -373,48 +437,70 @@ class DocumentReconstructor:
         """
         Analyze the formatting pattern of the original text
         """
-        pattern = {
-            'bold_positions': [],
-            'italic_positions': [],
-            'font_changes': [],
-            'size_changes': [],
-            'run_boundaries': []
-        }
+        # Pattern lists and the text helper are bound to locals for the per-run loop
+        bold_positions = []
+        italic_positions = []
+        font_changes = []
+        size_changes = []
+        run_boundaries = []
+        get_run_text = self._get_run_text
         
         char_position = 0
         
         for i, run in enumerate(runs):
             # Get run properties
-            rpr = run.find('w:rPr', self.processor.NAMESPACES)
-            run_text = self._get_run_text(run)
+            rpr = run.find(W_RPR)
+            run_text = get_run_text(run)
+            run_end = char_position + len(run_text)
             
             if rpr is not None:
+                # One pass over the run properties; the first rFonts/sz wins, as with
+                # find(), and switched-off toggles such as <w:b w:val="0"/> don't count
+                is_bold = is_italic = False
+                font_elem = sz_elem = None
+                for child in rpr:
+                    tag = child.tag
+                    if tag == W_B:
+                        is_bold = child.get(W_VAL) not in OFF_VALUES
+                    elif tag == W_I:
+                        is_italic = child.get(W_VAL) not in OFF_VALUES
+                    elif tag == W_RFONTS:
+                        if font_elem is None:
+                            font_elem = child
+                    elif tag == W_SZ:
+                        if sz_elem is None:
+                            sz_elem = child
+                
                 # Check for bold
-                if rpr.find('w:b', self.processor.NAMESPACES) is not None:
-                    pattern['bold_positions'].append((char_position, char_position + len(run_text)))
+                if is_bold:
+                    bold_positions.append((char_position, run_end))
                 
                 # Check for italic
-                if rpr.find('w:i', self.processor.NAMESPACES) is not None:
-                    pattern['italic_positions'].append((char_position, char_position + len(run_text)))
+                if is_italic:
+                    italic_positions.append((char_position, run_end))
                 
                 # Check for font changes
-                font_elem = rpr.find('w:rFonts', self.processor.NAMESPACES)
                 if font_elem is not None:
-                    font_name = font_elem.get(f'{{{self.processor.NAMESPACES["w"]}}}ascii')
+                    font_name = font_elem.get(W_ASCII)
                     if font_name:
-                        pattern['font_changes'].append((char_position, font_name))
+                        font_changes.append((char_position, font_name))
                 
                 # Check for size changes
-                sz_elem = rpr.find('w:sz', self.processor.NAMESPACES)
                 if sz_elem is not None:
-                    size = sz_elem.get(f'{{{self.processor.NAMESPACES["w"]}}}val')
+                    size = sz_elem.get(W_VAL)
                     if size:
-                        pattern['size_changes'].append((char_position, size))
+                        size_changes.append((char_position, size))
             
-            pattern['run_boundaries'].append((char_position, char_position + len(run_text), i))
-            char_position += len(run_text)
+            run_boundaries.append((char_position, run_end, i))
+            char_position = run_end
         
-        return pattern
+        return {
+            'bold_positions': bold_positions,
+            'italic_positions': italic_positions,
+            'font_changes': font_changes,
+            'size_changes': size_changes,
+            'run_boundaries': run_boundaries
+        }
     
     def _apply_formatting_pattern(self, runs: List[etree._Element], 
                                 new_text: str, pattern: Dict) -> bool:
@@ -438,30 +524,19 @@ class DocumentReconstructor:
             
             if len(original_boundaries) == len(runs):
                 # Distribute words proportionally based on original run sizes
-                total_original_chars = sum(end - start for start, end, _ in original_boundaries)
+                run_lengths = [end - start for start, end, _ in original_boundaries]
                 
-                if total_original_chars > 0:
+                if sum(run_lengths) > 0:
+                    word_counts = self._distribute_words(run_lengths, len(new_words))
+                    replace_run_text = self._replace_run_text
                     word_index = 0
                     
-                    for i, (start, end, run_idx) in enumerate(original_boundaries):
-                        if word_index >= len(new_words):
-                            self._replace_run_text(runs[run_idx], '')
-                            continue
-                        
-                        # Calculate proportion of text for this run
-                        run_length = end - start
-                        proportion = run_length / total_original_chars
-                        words_for_run = max(1, int(len(new_words) * proportion))
-                        
-                        # Handle last run
-                        if i == len(original_boundaries) - 1:
-                            words_for_run = len(new_words) - word_index
-                        
-                        # Extract words for this run
+                    for (_, _, run_idx), words_for_run in zip(original_boundaries, word_counts):
+                        # Extract words for this run; runs past the end are cleared
                         run_words = new_words[word_index:word_index + words_for_run]
                         run_text = ' '.join(run_words) if run_words else ''
                         
-                        self._replace_run_text(runs[run_idx], run_text)
+                        replace_run_text(runs[run_idx], run_text)
                         word_index += words_for_run
                     
                     return True
@@ -473,17 +548,37 @@ class DocumentReconstructor:
             print(f"⚠️  Pattern application failed: {e}")
             return False
     
+    @staticmethod
+    def _distribute_words(run_lengths: List[int], total_words: int) -> List[int]:
+        """Words per run in proportion to the original run lengths; the last run takes the rest"""
+        total_chars = sum(run_lengths)
+        last = len(run_lengths) - 1
+        counts = []
+        assigned = 0
+        
+        for i, run_length in enumerate(run_lengths):
+            if assigned >= total_words:
+                counts.append(0)
+            elif i == last:
+                counts.append(total_words - assigned)
+            else:
+                proportion = run_length / total_chars
+                counts.append(max(1, int(total_words * proportion)))
+            assigned += counts[-1]
+        
+        return counts
+    
     def _get_run_text(self, run_elem: etree._Element) -> str:
         """Get text content from a run element"""
-        text_elems = run_elem.xpath('.//w:t', namespaces=self.processor.NAMESPACES)
-        return ''.join(elem.text or '' for elem in text_elems)
+        # itertext() yields only the w:t texts and skips empty ones, all inside lxml
+        return ''.join(run_elem.itertext(W_T, with_tail=False))
     
     def _update_paragraph_text(self, para_elem: etree._Element, new_text: str):
         """
         Update paragraph text while preserving ALL formatting (fallback method)
         """
         # Find all run elements in this paragraph
-        runs = para_elem.xpath('.//w:r', namespaces=self.processor.NAMESPACES)
+        runs = list(para_elem.iter(W_R))
         
         if not runs:
             # No runs found, create a new one
@@ -493,9 +588,11 @@ class DocumentReconstructor:
         # Strategy: Distribute new text across existing runs proportionally
         words = new_text.split()
         
+        replace_run_text = self._replace_run_text
+        
         if len(runs) == 1:
             # Single run - replace all text
-            self._replace_run_text(runs[0], new_text)
+            replace_run_text(runs[0], new_text)
         else:
             # Multiple runs - distribute text while preserving formatting patterns
             words_per_run = max(1, len(words) // len(runs))
@@ -504,7 +601,7 @@ class DocumentReconstructor:
             for i, run in enumerate(runs):
                 if word_index >= len(words):
                     # No more words - clear this run
-                    self._replace_run_text(run, '')
+                    replace_run_text(run, '')
                     continue
                 
                 # Assign words to this run
@@ -516,14 +613,14 @@ class DocumentReconstructor:
                     word_index += words_per_run
                 
                 run_text = ' '.join(run_words) if run_words else ''
-                self._replace_run_text(run, run_text)
+                replace_run_text(run, run_text)
     
     def _replace_run_text(self, run_elem: etree._Element, new_text: str):
         """
         Replace text in a run while preserving formatting
         """
         # Find all text elements in this run
-        text_elems = run_elem.xpath('.//w:t', namespaces=self.processor.NAMESPACES)
+        text_elems = list(run_elem.iter(W_T))
         
         if text_elems:
             # Replace text in first element, remove others
@@ -534,20 +631,18 @@ class DocumentReconstructor:
                 text_elem.getparent().remove(text_elem)
         else:
             # No text element exists, create one
-            w_ns = self.processor.NAMESPACES['w']
-            text_elem = etree.Element(f'{{{w_ns}}}t')
+            text_elem = etree.SubElement(run_elem, W_T)
             text_elem.text = new_text
-            run_elem.append(text_elem)
     
-    def _write_xml_with_formatting_preservation(self, tree: etree._ElementTree, 
-                                              xml_path: str, original_content: bytes):
+    def _serialize_xml_with_formatting_preservation(self, root: etree._Element, 
+                                                  original_content: bytes) -> bytes:
         """
-        Write XML back while preserving maximum formatting
+        Serialize XML while preserving maximum formatting
         """
         try:
-            # Write with specific formatting options
+            # Serialize with specific formatting options
             xml_str = etree.tostring(
-                tree.getroot(),
+                root,
                 encoding='utf-8',
                 xml_declaration=True,
                 pretty_print=False,  # Don't add extra whitespace
@@ -564,44 +659,25 @@ class DocumentReconstructor:
                     new_declaration_end = xml_str.find(b'?>') + 2
                     xml_str = original_declaration + xml_str[new_declaration_end:]
             
-            with open(xml_path, 'wb') as f:
-                f.write(xml_str)
+            return xml_str
             
         except Exception as e:
             print(f"⚠️  Advanced XML writing failed, using standard method: {e}")
-            tree.write(xml_path, encoding='utf-8', xml_declaration=True, method='xml')
+            return etree.tostring(root.getroottree(), encoding='utf-8', xml_declaration=True, method='xml')
     
     def _create_new_run_with_text(self, para_elem: etree._Element, text: str):
         """
         Create a new run with text when no runs exist
         """
-        w_ns = self.processor.NAMESPACES['w']
-        
-        # Create run element
-        run_elem = etree.Element(f'{{{w_ns}}}r')
-        
-        # Create text element with proper attributes
-        text_elem = etree.Element(f'{{{w_ns}}}t')
+        # Create the run and its text element directly under their parents
+        run_elem = etree.SubElement(para_elem, W_R)
+        text_elem = etree.SubElement(run_elem, W_T)
         
         # Preserve space if needed
         if text.startswith(' ') or text.endswith(' ') or '  ' in text:
-            text_elem.set(f'{{{self.processor.NAMESPACES.get("xml", "http://www.w3.org/XML/1998/namespace")}}}space', 'preserve')
+            text_elem.set(XML_SPACE, 'preserve')
         
         text_elem.text = text
-        
-        run_elem.append(text_elem)
-        para_elem.append(run_elem)
-    
-    def _repack_docx(self, temp_dir: str, output_path: str):
-        """
-        Repack the modified files back into a docx
-        """
-        with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-            for root, dirs, files in os.walk(temp_dir):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    arc_path = os.path.relpath(file_path, temp_dir)
-                    zip_file.write(file_path, arc_path)
     
     def _create_fallback_document(self, content: str, output_path: str) -> bool:
         """
@@ -621,7 +697,8 @@ class DocumentReconstructor:
                 else:
                     doc.add_paragraph()  # Empty paragraph for spacing
             
-            doc.save(output_path)
+            with open(output_path, 'wb', buffering=1024 * 1024) as output_file:
+                doc.save(output_file)
             return True
             
         except Exception as e: